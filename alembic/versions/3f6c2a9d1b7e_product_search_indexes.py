@@ -0,0 +1,51 @@
+"""product search indexes
+
+Revision ID: 3f6c2a9d1b7e
+Revises: 1c9e5b7a3d20
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6c2a9d1b7e'
+down_revision = '1c9e5b7a3d20'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(name, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built concurrently so a large products table stays writable.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_search_document",
+            "products",
+            [sa.text(SEARCH_DOCUMENT)],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_products_name_trgm",
+            "products",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_products_name_trgm", table_name="products", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_products_search_document", table_name="products", postgresql_concurrently=True, if_exists=True)
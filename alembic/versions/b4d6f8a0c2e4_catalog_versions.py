@@ -0,0 +1,30 @@
+"""catalog version counters
+
+Revision ID: b4d6f8a0c2e4
+Revises: e2f4a6c8b0d1
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d6f8a0c2e4'
+down_revision = 'e2f4a6c8b0d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows are created by the first write to each namespace.
+    op.create_table(
+        "catalog_versions",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_versions")
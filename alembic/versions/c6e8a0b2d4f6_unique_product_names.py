@@ -0,0 +1,47 @@
+"""unique product names
+
+Revision ID: c6e8a0b2d4f6
+Revises: b4d6f8a0c2e4
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e8a0b2d4f6'
+down_revision = 'b4d6f8a0c2e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text("SELECT name FROM products GROUP BY name HAVING count(*) > 1 ORDER BY name LIMIT 20")
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "products.name is about to become unique; rename or merge the duplicated products first: "
+            + ", ".join(duplicates)
+        )
+
+    # Built concurrently so the table stays writable, then swapped in under
+    # the name create_all gives it.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_name_unique", "products", ["name"], unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index("ix_products_name", table_name="products", postgresql_concurrently=True, if_exists=True)
+    op.execute("ALTER INDEX ix_products_name_unique RENAME TO ix_products_name")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_name_plain", "products", ["name"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index("ix_products_name", table_name="products", postgresql_concurrently=True, if_exists=True)
+    op.execute("ALTER INDEX ix_products_name_plain RENAME TO ix_products_name")
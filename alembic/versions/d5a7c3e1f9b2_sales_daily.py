@@ -0,0 +1,47 @@
+"""sales daily rollup
+
+Revision ID: d5a7c3e1f9b2
+Revises: 8b2e4f7c9a13
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a7c3e1f9b2'
+down_revision = '8b2e4f7c9a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sales_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "product_id"),
+    )
+    op.create_index(op.f("ix_sales_daily_category_id"), "sales_daily", ["category_id"], unique=False)
+    # Backfill from existing orders; same rows as scripts/rebuild_sales_rollups.py.
+    op.execute(
+        """
+        INSERT INTO sales_daily (day, product_id, category_id, quantity, revenue)
+        SELECT date(timezone('UTC', orders.created_at)), order_items.product_id, products.category_id,
+               sum(order_items.quantity), sum(order_items.quantity * order_items.price)
+        FROM order_items
+        JOIN orders ON orders.id = order_items.order_id
+        JOIN products ON products.id = order_items.product_id
+        WHERE orders.status != 'CANCELLED'
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_sales_daily_category_id"), table_name="sales_daily")
+    op.drop_table("sales_daily")
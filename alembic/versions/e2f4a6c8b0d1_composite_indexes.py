@@ -0,0 +1,50 @@
+"""composite indexes for list, filter and export queries
+
+Revision ID: e2f4a6c8b0d1
+Revises: d5a7c3e1f9b2
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f4a6c8b0d1'
+down_revision = 'd5a7c3e1f9b2'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ("ix_orders_created", "orders", ["created_at", "id"], None),
+    ("ix_orders_user_created", "orders", ["user_id", "created_at", "id"], None),
+    ("ix_orders_status_created", "orders", ["status", "created_at", "id"], None),
+    ("ix_order_items_order_id", "order_items", ["order_id", "id"], None),
+    ("ix_order_items_product_id", "order_items", ["product_id"], None),
+    ("ix_products_created", "products", ["created_at", "id"], None),
+    ("ix_products_category_created", "products", ["category_id", "created_at", "id"], None),
+    ("ix_products_available_created", "products", ["created_at", "id"], "is_available = true"),
+    ("ix_users_created", "users", ["created_at", "id"], None),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so the tables stay writable.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
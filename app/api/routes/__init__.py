@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.routes import auth, users, categories, products, orders
+from app.api.routes import auth, users, categories, products, orders, admin, analytics
 
 api_router = APIRouter()
 
@@ -7,4 +7,6 @@ api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(categories.router, prefix="/categories", tags=["Categories"])
 api_router.include_router(products.router, prefix="/products", tags=["Products"])
-api_router.include_router(orders.router, prefix="/orders", tags=["Orders"])
\ No newline at end of file
+api_router.include_router(orders.router, prefix="/orders", tags=["Orders"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
\ No newline at end of file
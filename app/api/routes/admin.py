@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from app.crud.order import order_crud
+from app.crud.product import product_crud
+from app.crud.user import user_crud
+from app.dependencies import get_current_active_admin
+from app.models.order import OrderStatus
+from app.models.user import User
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+from app.schemas.user import UserResponse
+from app.utils.cache import catalog_cache, token_cache, user_cache
+from app.utils.export import EXPORT_CHUNK_SIZE, ExportFormat, stream_export
+from app.utils.order_events import order_events
+from app.utils.password_pool import password_pool
+from app.utils.pool_stats import async_pool_stats, sync_pool_stats
+from app.utils.projection import partial_schema
+
+router = APIRouter()
+
+# Exported order rows are flat (no order_items), so they fit CSV.
+_ORDER_EXPORT_SCHEMA = partial_schema(
+    OrderResponse, tuple(name for name in OrderResponse.model_fields if name != "order_items")
+)
+
+
+@router.get("/cache")
+async def get_cache_stats(current_user: User = Depends(get_current_active_admin)):
+    return {"catalog": catalog_cache.stats(), "users": user_cache.stats(), "tokens": token_cache.stats()}
+
+
+@router.get("/password-pool")
+async def get_password_pool_stats(current_user: User = Depends(get_current_active_admin)):
+    return password_pool.stats()
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(current_user: User = Depends(get_current_active_admin)):
+    """Connection pool occupancy, waits and checkout latency of each engine in this worker."""
+    stats = {"sync": sync_pool_stats.stats()}
+    if async_pool_stats.engine is not None:
+        stats["async"] = async_pool_stats.stats()
+    return stats
+
+
+@router.get("/order-events")
+async def get_order_event_stats(current_user: User = Depends(get_current_active_admin)):
+    return order_events.stats()
+
+
+@router.get("/export/orders")
+async def export_orders(
+    format: ExportFormat = "ndjson",
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    status_filter: Optional[OrderStatus] = None,
+    chunk_size: int = Query(EXPORT_CHUNK_SIZE, ge=1, le=10000),
+    current_user: User = Depends(get_current_active_admin)
+):
+    statement = order_crud.export_select(created_from, created_to, status=status_filter)
+    return stream_export(statement, _ORDER_EXPORT_SCHEMA, format, "orders", chunk_size)
+
+
+@router.get("/export/products")
+async def export_products(
+    format: ExportFormat = "ndjson",
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+    chunk_size: int = Query(EXPORT_CHUNK_SIZE, ge=1, le=10000),
+    current_user: User = Depends(get_current_active_admin)
+):
+    statement = product_crud.export_select(created_from, created_to, category_id=category_id)
+    return stream_export(statement, ProductResponse, format, "products", chunk_size)
+
+
+@router.get("/export/users")
+async def export_users(
+    format: ExportFormat = "ndjson",
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    chunk_size: int = Query(EXPORT_CHUNK_SIZE, ge=1, le=10000),
+    current_user: User = Depends(get_current_active_admin)
+):
+    statement = user_crud.export_select(created_from, created_to)
+    return stream_export(statement, UserResponse, format, "users", chunk_size)
@@ -0,0 +1,49 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from app.database import AnySession, get_session
+from app.crud.sales import async_sales_crud
+from app.dependencies import get_current_active_admin
+from app.models.user import User
+from app.schemas.sales import CategorySales, DailySales, ProductSales
+from app.utils.projection import list_adapter
+from app.utils.responses import render_json
+
+router = APIRouter()
+
+# Every report reads the sales_daily rollup, never orders or order_items;
+# date_from and date_to are inclusive UTC days.
+
+
+@router.get("/sales/daily", response_model=List[DailySales])
+async def get_daily_sales(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AnySession = Depends(get_session),
+    current_user: User = Depends(get_current_active_admin)
+):
+    rows = await async_sales_crud.daily(db, date_from, date_to)
+    return render_json(list_adapter(DailySales), rows)
+
+
+@router.get("/sales/products", response_model=List[ProductSales])
+async def get_product_sales(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AnySession = Depends(get_session),
+    current_user: User = Depends(get_current_active_admin)
+):
+    rows = await async_sales_crud.by_product(db, date_from, date_to, limit=limit)
+    return render_json(list_adapter(ProductSales), rows)
+
+
+@router.get("/sales/categories", response_model=List[CategorySales])
+async def get_category_sales(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AnySession = Depends(get_session),
+    current_user: User = Depends(get_current_active_admin)
+):
+    rows = await async_sales_crud.by_category(db, date_from, date_to)
+    return render_json(list_adapter(CategorySales), rows)
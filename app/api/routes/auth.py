@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 from datetime import timedelta
-from app.database import get_db
+from app.database import AnySession, get_session
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.crud.user import user_crud
+from app.schemas.token import RefreshTokenRequest, TokenResponse
+from app.crud.user import async_user_crud
+from app.crud.refresh_token import async_refresh_token_crud
 from app.utils.security import create_access_token
 from app.config import settings
 
@@ -12,29 +13,29 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    if user_crud.get_by_email(db, email=user_in.email):
+async def register(user_in: UserCreate, db: AnySession = Depends(get_session)):
+    if await async_user_crud.get_by_email(db, email=user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    if user_crud.get_by_username(db, username=user_in.username):
+    if await async_user_crud.get_by_username(db, username=user_in.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    user = user_crud.create(db, user_in)
+    user = await async_user_crud.create(db, user_in)
     return user
 
 
 @router.post("/login")
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    db: AnySession = Depends(get_session),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
-    user = user_crud.authenticate(db, email=form_data.username, password=form_data.password)
+    user = await async_user_crud.authenticate(db, email=form_data.username, password=form_data.password)
     
     if not user:
         raise HTTPException(
@@ -53,10 +54,47 @@ def login(
     access_token = create_access_token(
         data={"sub": str(user.id)}, expires_delta=access_token_expires
     )
+    refresh_token = await async_refresh_token_crud.issue(db, user.id)
     
     return {
         "access_token": access_token,
+        "refresh_token": refresh_token,
         "token_type": "bearer",
         "user": UserResponse.model_validate(user)
     }
 
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(token_in: RefreshTokenRequest, db: AnySession = Depends(get_session)):
+    """Exchange a refresh token for a new access token without re-entering the password.
+
+    The refresh token is single use: the response carries its replacement.
+    """
+    rotated = await async_refresh_token_crud.rotate(db, token_in.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user_id, refresh_token = rotated
+
+    user = await async_user_crud.get_principal(db, user_id)
+    if not user or not user.is_active:
+        await async_refresh_token_crud.revoke(db, refresh_token)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+
+    access_token = create_access_token(
+        data={"sub": str(user_id)},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token_in: RefreshTokenRequest, db: AnySession = Depends(get_session)):
+    await async_refresh_token_crud.revoke(db, token_in.refresh_token)
+
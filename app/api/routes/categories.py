@@ -1,28 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+from typing import List, Optional
+from app.database import AnySession, get_session
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.crud.category import category_crud
-from app.dependencies import get_current_active_admin
+from app.crud.category import async_category_crud, CACHE_NAMESPACE
+from app.crud.catalog import async_catalog_version_crud
+from app.dependencies import get_current_active_admin, get_page_cursor
 from app.models.user import User
+from app.utils.cache import catalog_cache
+from app.utils.etag import cached_json
+from app.utils.pagination import Cursor, next_cursor_headers
 
 router = APIRouter()
 
+_category_list = TypeAdapter(List[CategoryResponse])
+
 
 @router.get("/", response_model=List[CategoryResponse])
-def get_categories(
+async def get_categories(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    after: Optional[Cursor] = Depends(get_page_cursor),
+    db: AnySession = Depends(get_session)
 ):
-    categories = category_crud.get_multi(db, skip=skip, limit=limit)
-    return categories
+    return await cached_json(
+        request, catalog_cache, CACHE_NAMESPACE,
+        lambda: async_catalog_version_crud.get(db, CACHE_NAMESPACE),
+        lambda: async_category_crud.get_multi(db, skip=skip, limit=limit, after=after),
+        _category_list,
+        lambda categories: next_cursor_headers(categories, limit)
+    )
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(category_id: int, db: Session = Depends(get_db)):
-    category = category_crud.get(db, category_id)
+async def get_category(category_id: int, db: AnySession = Depends(get_session)):
+    category = await async_category_crud.get(db, category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -32,29 +45,29 @@ def get_category(category_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category_in: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    if category_crud.get_by_name(db, name=category_in.name):
+    if await async_category_crud.get_by_name(db, name=category_in.name):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Category with this name already exists"
         )
     
-    category = category_crud.create(db, category_in)
+    category = await async_category_crud.create(db, category_in)
     return category
 
 
 @router.put("/{category_id}", response_model=CategoryResponse)
-def update_category(
+async def update_category(
     category_id: int,
     category_in: CategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    category = category_crud.update(db, category_id, category_in)
+    category = await async_category_crud.update(db, category_id, category_in)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,12 +77,12 @@ def update_category(
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(
+async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    success = category_crud.delete(db, category_id)
+    success = await async_category_crud.delete(db, category_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,42 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
-from app.crud.order import order_crud
-from app.dependencies import get_current_user, get_current_active_admin
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional, Tuple
+from app.config import settings
+from app.database import AnySession, close_session, get_session
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderStatusBatch, OrderStatusBatchResult, OrderStatusEvent
+)
+from app.schemas.user import UserResponse
+from app.crud.order import async_order_crud
+from app.dependencies import (
+    field_selector, get_current_user, get_current_active_admin, get_page_cursor, get_token_principal
+)
 from app.models.user import User
 from app.models.order import OrderStatus
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.order_events import order_events
+from app.utils.pagination import Cursor, next_cursor_headers
+from app.utils.projection import list_adapter, partial_schema
+from app.utils.responses import render_json
 
 router = APIRouter()
 
+_ORDER_FIELDS = tuple(name for name in OrderResponse.model_fields if name != "order_items")
+
+# Status streams end once the order reaches one of these.
+_FINAL_STATUSES = (OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+
 
 @router.get("/", response_model=List[OrderResponse])
-def get_orders(
+async def get_orders(
     skip: int = 0,
     limit: int = 100,
     status_filter: Optional[OrderStatus] = None,
-    db: Session = Depends(get_db),
+    after: Optional[Cursor] = Depends(get_page_cursor),
+    fields: Optional[Tuple[str, ...]] = Depends(field_selector(OrderResponse, exclude=("order_items",))),
+    include_items: bool = True,
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
+    page = dict(skip=skip, limit=limit, after=after, fields=fields, include_items=include_items)
     if current_user.is_admin:
-        if status_filter:
-            orders = order_crud.get_by_status(db, status=status_filter, skip=skip, limit=limit)
-        else:
-            orders = order_crud.get_multi(db, skip=skip, limit=limit)
+        orders = await async_order_crud.get_rows(db, status=status_filter, **page)
     else:
-        orders = order_crud.get_by_user(db, user_id=current_user.id, skip=skip, limit=limit)
-    
-    return orders
+        orders = await async_order_crud.get_rows(db, user_id=current_user.id, **page)
+
+    shape = None
+    if fields is not None or not include_items:
+        shape = (fields or _ORDER_FIELDS) + (("order_items",) if include_items else ())
+    adapter = list_adapter(partial_schema(OrderResponse, shape))
+    return render_json(adapter, orders, headers=next_cursor_headers(orders, limit))
+
+
+def _order_etag(order_id: int, status: OrderStatus, created_at, updated_at) -> str:
+    # The status is hashed too: updated_at has one-second resolution on SQLite.
+    return make_etag(f"{order_id}:{status.value}:{created_at}:{updated_at}".encode())
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(
+async def get_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    order = order_crud.get(db, order_id)
+    # A conditional request is answered from a one-row version lookup; the
+    # order and its items are only loaded for a 200.
+    if request.headers.get("if-none-match"):
+        version = await async_order_crud.get_version(db, order_id)
+        if version and (current_user.is_admin or version.user_id == current_user.id):
+            etag = _order_etag(order_id, version.status, version.created_at, version.updated_at)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+    order = await async_order_crud.get(db, order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,17 +86,139 @@ def get_order(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    
+
+    response.headers["ETag"] = _order_etag(order.id, order.status, order.created_at, order.updated_at)
     return order
 
 
+async def _current_status(db: AnySession, order_id: int, current_user: UserResponse) -> OrderStatusEvent:
+    version = await async_order_crud.get_version(db, order_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+
+    if not current_user.is_admin and version.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return OrderStatusEvent(order_id=order_id, status=version.status, updated_at=version.updated_at)
+
+
+async def _status_events(
+    queue: asyncio.Queue, current: OrderStatusEvent
+) -> AsyncIterator[Optional[OrderStatusEvent]]:
+    """``current``, then every change from ``queue`` until the order is delivered or cancelled.
+
+    Yields None after ORDER_EVENTS_HEARTBEAT quiet seconds, for keep-alives.
+    """
+    yield current
+    while current.status not in _FINAL_STATUSES:
+        try:
+            event = await asyncio.wait_for(queue.get(), settings.ORDER_EVENTS_HEARTBEAT)
+        except asyncio.TimeoutError:
+            yield None
+            continue
+        # The subscription starts before the status is read, so the first
+        # event may already be reflected in ``current``.
+        if event != current:
+            current = event
+            yield current
+
+
+@router.get("/{order_id}/events", response_class=StreamingResponse)
+async def stream_order_status(
+    order_id: int,
+    db: AnySession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Server-sent events with the order's status: the current one, then each change.
+
+    Replaces polling GET /orders/{order_id}; the stream ends after the order
+    is delivered or cancelled.
+    """
+    queue = order_events.subscribe(order_id)
+    try:
+        current = await _current_status(db, order_id, current_user)
+    except HTTPException:
+        order_events.unsubscribe(order_id, queue)
+        raise
+    # An idle stream must not hold a pooled connection.
+    await close_session(db)
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for event in _status_events(queue, current):
+                if event is None:
+                    yield b": keep-alive\n\n"
+                else:
+                    yield b"event: status\ndata: " + event.model_dump_json().encode() + b"\n\n"
+        finally:
+            order_events.unsubscribe(order_id, queue)
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/{order_id}/ws")
+async def order_status_socket(
+    websocket: WebSocket,
+    order_id: int,
+    token: str = Query(...),
+    db: AnySession = Depends(get_session)
+):
+    """WebSocket sending the order's status as JSON: the current one, then each change.
+
+    Browsers cannot set headers on a WebSocket, so the access token is passed
+    as ``?token=``. The server closes the socket after the order is
+    delivered or cancelled; messages from the client are ignored.
+    """
+    queue = order_events.subscribe(order_id)
+    try:
+        try:
+            current_user = await get_token_principal(db, token)
+            if current_user is None or not current_user.is_active:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+            current = await _current_status(db, order_id, current_user)
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+            return
+        finally:
+            await close_session(db)
+
+        await websocket.accept()
+
+        async def send_events():
+            async for event in _status_events(queue, current):
+                if event is not None:
+                    await websocket.send_text(event.model_dump_json())
+
+        async def wait_for_disconnect():
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        sender = asyncio.create_task(send_events())
+        receiver = asyncio.create_task(wait_for_disconnect())
+        done, pending = await asyncio.wait((sender, receiver), return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        if sender in done:
+            sender.result()
+            await websocket.close()
+    finally:
+        order_events.unsubscribe(order_id, queue)
+
+
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-def create_order(
+async def create_order(
     order_in: OrderCreate,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    order = order_crud.create(db, user_id=current_user.id, order_in=order_in)
+    order = await async_order_crud.create(db, user_id=current_user.id, order_in=order_in)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -67,14 +227,32 @@ def create_order(
     return order
 
 
+@router.post("/status", response_model=OrderStatusBatchResult)
+async def update_orders_status(
+    batch: OrderStatusBatch,
+    db: AnySession = Depends(get_session),
+    current_user: User = Depends(get_current_active_admin)
+):
+    if batch.status == OrderStatus.CANCELLED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Orders are cancelled one at a time with POST /orders/{order_id}/cancel"
+        )
+
+    updated = await async_order_crud.set_status_many(db, batch.order_ids, batch.status)
+    done = set(updated)
+    skipped = sorted({order_id for order_id in batch.order_ids if order_id not in done})
+    return OrderStatusBatchResult(status=batch.status, updated=updated, skipped=skipped)
+
+
 @router.put("/{order_id}", response_model=OrderResponse)
-def update_order(
+async def update_order(
     order_id: int,
     order_in: OrderUpdate,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    order = order_crud.get(db, order_id)
+    order = await async_order_crud.get(db, order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -93,17 +271,17 @@ def update_order(
             detail="Only admins can update order status"
         )
     
-    updated_order = order_crud.update(db, order_id, order_in)
+    updated_order = await async_order_crud.update(db, order_id, order_in)
     return updated_order
 
 
 @router.post("/{order_id}/cancel", response_model=OrderResponse)
-def cancel_order(
+async def cancel_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    order = order_crud.get(db, order_id)
+    order = await async_order_crud.get(db, order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,7 +294,7 @@ def cancel_order(
             detail="Not enough permissions"
         )
     
-    cancelled_order = order_crud.cancel(db, order_id)
+    cancelled_order = await async_order_crud.cancel(db, order_id)
     if not cancelled_order:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -127,12 +305,12 @@ def cancel_order(
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_order(
+async def delete_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    success = order_crud.delete(db, order_id)
+    success = await async_order_crud.delete(db, order_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,78 +1,154 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from app.crud.product import product_crud
-from app.crud.category import category_crud
-from app.dependencies import get_current_active_admin
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status, Query
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
+from app.database import AnySession, get_session
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductImportResult
+from app.crud.product import (
+    async_product_crud, product_namespace, CACHE_NAMESPACE, IMPORT_BATCH_SIZE, DuplicateProductName
+)
+from app.crud.category import async_category_crud
+from app.crud.catalog import async_catalog_version_crud
+from app.dependencies import field_selector, get_current_active_admin, get_page_cursor
 from app.models.user import User
+from app.utils.bulk_import import FORMATS, detect_format, read_records
+from app.utils.cache import catalog_cache
+from app.utils.etag import cached_json
+from app.utils.pagination import Cursor, next_cursor_headers
+from app.utils.projection import list_adapter, partial_schema
 
 router = APIRouter()
 
+_product = TypeAdapter(ProductResponse)
+
+
+def _name_taken() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Product with this name already exists"
+    )
+
 
 @router.get("/", response_model=List[ProductResponse])
-def get_products(
+async def get_products(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     category_id: Optional[int] = None,
     available_only: bool = False,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    after: Optional[Cursor] = Depends(get_page_cursor),
+    fields: Optional[Tuple[str, ...]] = Depends(field_selector(ProductResponse)),
+    db: AnySession = Depends(get_session)
 ):
-    if search:
-        products = product_crud.search(db, query=search, skip=skip, limit=limit)
-    elif category_id:
-        products = product_crud.get_by_category(db, category_id=category_id, skip=skip, limit=limit)
-    elif available_only:
-        products = product_crud.get_available(db, skip=skip, limit=limit)
-    else:
-        products = product_crud.get_multi(db, skip=skip, limit=limit)
-    
-    return products
+    if search and after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search results are ranked by relevance and page with skip, not cursor"
+        )
+
+    async def load():
+        if search:
+            return await async_product_crud.search(db, query=search, skip=skip, limit=limit, fields=fields)
+        elif category_id:
+            return await async_product_crud.get_by_category(
+                db, category_id=category_id, skip=skip, limit=limit, after=after, fields=fields
+            )
+        elif available_only:
+            return await async_product_crud.get_available(db, skip=skip, limit=limit, after=after, fields=fields)
+        return await async_product_crud.get_multi(db, skip=skip, limit=limit, after=after, fields=fields)
+
+    def headers(products):
+        # Search results are ranked by relevance, so they page by offset only.
+        return {} if search else next_cursor_headers(products, limit)
+
+    adapter = list_adapter(partial_schema(ProductResponse, fields))
+    return await cached_json(
+        request, catalog_cache, CACHE_NAMESPACE,
+        lambda: async_catalog_version_crud.get(db, CACHE_NAMESPACE), load, adapter, headers
+    )
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = product_crud.get(db, product_id)
-    if not product:
+async def get_product(product_id: int, request: Request, db: AnySession = Depends(get_session)):
+    response = await cached_json(
+        request, catalog_cache, product_namespace(product_id),
+        lambda: async_product_crud.get_version(db, product_id),
+        lambda: async_product_crud.get(db, product_id),
+        _product
+    )
+    if not response:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    return product
+    return response
 
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
-def create_product(
+async def create_product(
     product_in: ProductCreate,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    if not category_crud.get(db, product_in.category_id):
+    if not await async_category_crud.get(db, product_in.category_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
+    if await async_product_crud.get_by_name(db, name=product_in.name):
+        raise _name_taken()
     
-    product = product_crud.create(db, product_in)
+    try:
+        product = await async_product_crud.create(db, product_in)
+    except DuplicateProductName:
+        raise _name_taken()
     return product
 
 
+@router.post("/import", response_model=ProductImportResult)
+async def import_products(
+    file: UploadFile = File(..., description="CSV with a header row, or JSON Lines"),
+    format: Optional[str] = Query(None, description="csv or jsonl; detected from the file name by default"),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=10000),
+    db: AnySession = Depends(get_session),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """Create or update products from a supplier feed, matched by name.
+
+    Each row carries ProductCreate fields, with the category given as
+    ``category_id`` or ``category`` (its name). Invalid rows are listed in
+    ``errors`` and skipped; the rest of the file is still imported.
+    """
+    format = format or detect_format(file.filename, file.content_type)
+    if format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported format, expected csv or jsonl"
+        )
+    return await async_product_crud.import_rows(db, read_records(file.file, format), batch_size=batch_size)
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
-def update_product(
+async def update_product(
     product_id: int,
     product_in: ProductUpdate,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    if product_in.category_id and not category_crud.get(db, product_in.category_id):
+    if product_in.category_id and not await async_category_crud.get(db, product_in.category_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
+    if product_in.name:
+        existing = await async_product_crud.get_by_name(db, name=product_in.name)
+        if existing and existing.id != product_id:
+            raise _name_taken()
     
-    product = product_crud.update(db, product_id, product_in)
+    try:
+        product = await async_product_crud.update(db, product_id, product_in)
+    except DuplicateProductName:
+        raise _name_taken()
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,12 +158,12 @@ def update_product(
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(
+async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    success = product_crud.delete(db, product_id)
+    success = await async_product_crud.delete(db, product_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
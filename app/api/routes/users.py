@@ -1,48 +1,53 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional, Tuple
+from app.database import AnySession, get_session
 from app.schemas.user import UserResponse, UserUpdate
-from app.crud.user import user_crud
-from app.dependencies import get_current_user, get_current_active_admin
+from app.crud.user import async_user_crud
+from app.dependencies import field_selector, get_current_user, get_current_active_admin, get_page_cursor
 from app.models.user import User
+from app.utils.pagination import Cursor, next_cursor_headers
+from app.utils.projection import list_adapter, partial_schema
+from app.utils.responses import render_json
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 
 @router.put("/me", response_model=UserResponse)
-def update_current_user(
+async def update_current_user(
     user_in: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    user = user_crud.update(db, current_user.id, user_in)
+    user = await async_user_crud.update(db, current_user.id, user_in)
     return user
 
 
 @router.get("/", response_model=List[UserResponse])
-def get_users(
+async def get_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: Optional[Cursor] = Depends(get_page_cursor),
+    fields: Optional[Tuple[str, ...]] = Depends(field_selector(UserResponse)),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    users = user_crud.get_multi(db, skip=skip, limit=limit)
-    return users
+    users = await async_user_crud.get_multi(db, skip=skip, limit=limit, after=after, fields=fields)
+    adapter = list_adapter(partial_schema(UserResponse, fields))
+    return render_json(adapter, users, headers=next_cursor_headers(users, limit))
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    user = user_crud.get(db, user_id)
+    user = await async_user_crud.get(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -52,12 +57,12 @@ def get_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     current_user: User = Depends(get_current_active_admin)
 ):
-    success = user_crud.delete(db, user_id)
+    success = await async_user_crud.delete(db, user_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,6 +1,11 @@
-from app.crud.user import user_crud
-from app.crud.category import category_crud
-from app.crud.product import product_crud
-from app.crud.order import order_crud
+from app.crud.user import user_crud, async_user_crud
+from app.crud.category import category_crud, async_category_crud
+from app.crud.product import product_crud, async_product_crud
+from app.crud.order import order_crud, async_order_crud
+from app.crud.refresh_token import refresh_token_crud, async_refresh_token_crud
 
-__all__ = ["user_crud", "category_crud", "product_crud", "order_crud"]
\ No newline at end of file
+__all__ = [
+    "user_crud", "category_crud", "product_crud", "order_crud", "refresh_token_crud",
+    "async_user_crud", "async_category_crud", "async_product_crud", "async_order_crud",
+    "async_refresh_token_crud",
+]
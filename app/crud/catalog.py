@@ -0,0 +1,62 @@
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Iterable
+from app.database import AnySession, run_crud
+from app.models.catalog import CatalogVersion
+from app.utils.cache import catalog_cache, invalidate_on_commit
+
+
+class CatalogVersionCRUD:
+    """Version counters of the cached catalog namespaces (catalog_versions)."""
+
+    def get(self, db: Session, name: str) -> int:
+        """Current version of ``name``; 0 before its first write. One primary-key read."""
+        return db.execute(select(CatalogVersion.version).where(CatalogVersion.name == name)).scalar() or 0
+
+    def bump(self, db: Session, names: Iterable[str]) -> None:
+        """Increment every counter in ``names`` in one upsert. Does not commit."""
+        rows = [{"name": name, "version": 1} for name in sorted(names)]
+        if not rows:
+            return
+        insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = insert(CatalogVersion).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[CatalogVersion.name],
+            set_={"version": CatalogVersion.version + 1}
+        ))
+
+
+catalog_version_crud = CatalogVersionCRUD()
+
+
+def catalog_changed(db: Session, namespace: str) -> None:
+    """Record a write to catalog ``namespace``: its version is bumped as ``db`` commits, then the cache is invalidated.
+
+    The bump runs inside the transaction, right before the commit, so the
+    counter row is locked only briefly and rolls back with the write.
+    """
+    invalidate_on_commit(db, catalog_cache, namespace)
+    db.info.setdefault("catalog_versions", set()).add(namespace)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(db: Session) -> None:
+    names = db.info.pop("catalog_versions", None)
+    if names:
+        catalog_version_crud.bump(db, names)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(db: Session, previous_transaction) -> None:
+    db.info.pop("catalog_versions", None)
+
+
+class AsyncCatalogVersionCRUD:
+    """Async facade over CatalogVersionCRUD; never cached, it is what cached responses are checked against."""
+
+    async def get(self, db: AnySession, name: str) -> int:
+        return await run_crud(db, catalog_version_crud.get, name)
+
+
+async_catalog_version_crud = AsyncCatalogVersionCRUD()
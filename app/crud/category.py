@@ -1,7 +1,19 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from typing import Optional, List
+from app.database import AnySession, run_crud
+from app.utils.cache import cached_read, catalog_cache
+from app.crud.catalog import catalog_changed
+from app.utils.pagination import Cursor, paginate
+from app.utils.projection import schema_columns
 from app.models.category import Category
-from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+
+# Catalog cache namespace (and catalog version) of category reads; bumped by every category write.
+CACHE_NAMESPACE = "categories"
+
+# Columns read by get_multi, which returns rows rather than entities.
+_LIST_COLUMNS = schema_columns(Category, CategoryResponse)
 
 
 class CategoryCRUD:
@@ -11,12 +23,13 @@ class CategoryCRUD:
     def get_by_name(self, db: Session, name: str) -> Optional[Category]:
         return db.query(Category).filter(Category.name == name).first()
 
-    def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> List[Category]:
-        return db.query(Category).offset(skip).limit(limit).all()
+    def get_multi(self, db: Session, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None) -> List[Row]:
+        return paginate(db.query(*_LIST_COLUMNS), Category, skip, limit, after).all()
 
     def create(self, db: Session, category_in: CategoryCreate) -> Category:
         db_category = Category(**category_in.model_dump())
         db.add(db_category)
+        catalog_changed(db, CACHE_NAMESPACE)
         db.commit()
         db.refresh(db_category)
         return db_category
@@ -30,6 +43,7 @@ class CategoryCRUD:
         for field, value in update_data.items():
             setattr(db_category, field, value)
         
+        catalog_changed(db, CACHE_NAMESPACE)
         db.commit()
         db.refresh(db_category)
         return db_category
@@ -40,8 +54,44 @@ class CategoryCRUD:
             return False
         
         db.delete(db_category)
+        catalog_changed(db, CACHE_NAMESPACE)
         db.commit()
         return True
 
 
-category_crud = CategoryCRUD()
\ No newline at end of file
+category_crud = CategoryCRUD()
+
+
+class AsyncCategoryCRUD:
+    """Async facade over CategoryCRUD; reads return cached ``CategoryResponse`` snapshots."""
+
+    async def get(self, db: AnySession, category_id: int) -> Optional[CategoryResponse]:
+        return await cached_read(
+            catalog_cache, CACHE_NAMESPACE, ("get", category_id),
+            lambda: run_crud(db, category_crud.get, category_id),
+            CategoryResponse
+        )
+
+    async def get_by_name(self, db: AnySession, name: str) -> Optional[Category]:
+        return await run_crud(db, category_crud.get_by_name, name)
+
+    async def get_multi(
+        self, db: AnySession, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None
+    ) -> List[CategoryResponse]:
+        return await cached_read(
+            catalog_cache, CACHE_NAMESPACE, ("get_multi", skip, limit, after),
+            lambda: run_crud(db, category_crud.get_multi, skip=skip, limit=limit, after=after),
+            CategoryResponse
+        )
+
+    async def create(self, db: AnySession, category_in: CategoryCreate) -> Category:
+        return await run_crud(db, category_crud.create, category_in)
+
+    async def update(self, db: AnySession, category_id: int, category_in: CategoryUpdate) -> Optional[Category]:
+        return await run_crud(db, category_crud.update, category_id, category_in)
+
+    async def delete(self, db: AnySession, category_id: int) -> bool:
+        return await run_crud(db, category_crud.delete, category_id)
+
+
+async_category_crud = AsyncCategoryCRUD()
@@ -1,78 +1,206 @@
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from app.models.order import Order, OrderItem, OrderStatus
-from app.schemas.order import OrderCreate, OrderUpdate
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload, lazyload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Select
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional, List, Sequence
+from app.database import AnySession, run_crud
+from app.utils.export import export_select
+from app.utils.pagination import Cursor, paginate
+from app.utils.projection import schema_columns, select_columns
+from app.models.order import Order, OrderItem, OrderStatus, previous_statuses
+from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderItemResponse, OrderStatusEvent
 from app.crud.product import product_crud
+from app.crud.sales import sales_crud
+from app.utils.order_events import order_events
+
+
+# How Order.order_items is loaded by the read methods. "selectin" costs one
+# extra SELECT per page, "joined" folds the items into the order query, and
+# "lazy" defers them to attribute access (one SELECT per order).
+ItemLoading = Literal["selectin", "joined", "lazy"]
+
+_ITEM_LOADERS = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "lazy": lazyload,
+}
+
+# Columns read by get_rows.
+_ORDER_COLUMNS = schema_columns(Order, OrderResponse)
+_ITEM_COLUMNS = schema_columns(OrderItem, OrderItemResponse)
 
 
 class OrderCRUD:
-    def get(self, db: Session, order_id: int) -> Optional[Order]:
-        return db.query(Order).filter(Order.id == order_id).first()
+    def _query(self, db: Session, load_items: ItemLoading):
+        return db.query(Order).options(_ITEM_LOADERS[load_items](Order.order_items))
+
+    def get(self, db: Session, order_id: int, load_items: ItemLoading = "selectin") -> Optional[Order]:
+        return self._query(db, load_items).filter(Order.id == order_id).first()
+
+    def get_version(self, db: Session, order_id: int) -> Optional[Row]:
+        """(user_id, status, created_at, updated_at) of an order, without loading it or its items.
+
+        Every write to an order bumps updated_at and items never change after
+        creation, so this identifies the order's current state.
+        """
+        return db.execute(
+            select(Order.user_id, Order.status, Order.created_at, Order.updated_at).where(Order.id == order_id)
+        ).first()
 
-    def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> List[Order]:
-        return db.query(Order).offset(skip).limit(limit).all()
+    def get_multi(
+        self, db: Session, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, load_items: ItemLoading = "selectin"
+    ) -> List[Order]:
+        return paginate(self._query(db, load_items), Order, skip, limit, after).all()
 
-    def get_by_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Order]:
-        return db.query(Order).filter(Order.user_id == user_id).offset(skip).limit(limit).all()
+    def get_by_user(
+        self, db: Session, user_id: int, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, load_items: ItemLoading = "selectin"
+    ) -> List[Order]:
+        return paginate(
+            self._query(db, load_items).filter(Order.user_id == user_id), Order, skip, limit, after
+        ).all()
 
-    def get_by_status(self, db: Session, status: OrderStatus, skip: int = 0, limit: int = 100) -> List[Order]:
-        return db.query(Order).filter(Order.status == status).offset(skip).limit(limit).all()
+    def get_by_status(
+        self, db: Session, status: OrderStatus, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, load_items: ItemLoading = "selectin"
+    ) -> List[Order]:
+        return paginate(
+            self._query(db, load_items).filter(Order.status == status), Order, skip, limit, after
+        ).all()
+
+    def get_rows(
+        self, db: Session, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None,
+        user_id: Optional[int] = None, status: Optional[OrderStatus] = None,
+        fields: Optional[Sequence[str]] = None, include_items: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Read-only list of orders as dicts shaped like OrderResponse.
+
+        Selects only the response columns (narrowed to ``fields``), orders
+        and then their items in one IN query, without building entities; for
+        list endpoints. ``include_items=False`` skips the items query.
+        """
+        query = db.query(*select_columns(_ORDER_COLUMNS, fields))
+        if user_id is not None:
+            query = query.filter(Order.user_id == user_id)
+        if status is not None:
+            query = query.filter(Order.status == status)
+        orders = [row._asdict() for row in paginate(query, Order, skip, limit, after)]
+        if not orders or not include_items:
+            return orders
+
+        items = defaultdict(list)
+        order_ids = [order["id"] for order in orders]
+        for item in db.query(*_ITEM_COLUMNS).filter(OrderItem.order_id.in_(order_ids)).order_by(OrderItem.id):
+            items[item.order_id].append(item._asdict())
+        for order in orders:
+            order["order_items"] = items[order["id"]]
+        return orders
+
+    def export_select(
+        self, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+        status: Optional[OrderStatus] = None
+    ) -> Select:
+        """Statement for a streamed export: the order columns of OrderResponse, without items."""
+        statement = export_select(_ORDER_COLUMNS, Order, created_from, created_to)
+        if status is not None:
+            statement = statement.where(Order.status == status)
+        return statement
 
     def create(self, db: Session, user_id: int, order_in: OrderCreate) -> Optional[Order]:
+        """Place an order in a fixed number of statements regardless of cart size.
+
+        Stock is reserved by one conditional UPDATE ... RETURNING over every
+        referenced product, which also yields the prices; then one INSERT for
+        the order and one multi-row INSERT ... RETURNING for its items.
+        """
+        requested = {}
+        for item in order_in.items:
+            requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+
+        prices = product_crud.reserve_stock(db, requested)
+        if len(prices) != len(requested):
+            db.rollback()
+            return None
+
         total_amount = 0.0
         order_items_data = []
-
         for item in order_in.items:
-            product = product_crud.get(db, item.product_id)
-            if not product:
-                return None
-            if not product.is_available:
-                return None
-            if product.stock_quantity < item.quantity:
-                return None
-            
-            item_price = product.price * item.quantity
-            total_amount += item_price
-            
+            price = prices[item.product_id]
+            total_amount += price * item.quantity
             order_items_data.append({
                 "product_id": item.product_id,
                 "quantity": item.quantity,
-                "price": product.price
+                "price": price
             })
-            
-            product.stock_quantity -= item.quantity
 
         db_order = Order(
             user_id=user_id,
+            status=OrderStatus.PENDING,
             total_amount=total_amount,
             delivery_address=order_in.delivery_address,
             phone=order_in.phone,
-            notes=order_in.notes
+            notes=order_in.notes,
+            updated_at=None
         )
         db.add(db_order)
         db.flush()
 
         for item_data in order_items_data:
-            db_order_item = OrderItem(order_id=db_order.id, **item_data)
-            db.add(db_order_item)
+            item_data["order_id"] = db_order.id
+        order_items = db.scalars(insert(OrderItem).returning(OrderItem), order_items_data).all()
+        set_committed_value(db_order, "order_items", order_items)
+        sales_crud.record_orders(db, [db_order.id])
 
         db.commit()
-        db.refresh(db_order)
         return db_order
 
     def update(self, db: Session, order_id: int, order_in: OrderUpdate) -> Optional[Order]:
-        db_order = self.get(db, order_id)
+        db_order = self.get(db, order_id, load_items="lazy")
         if not db_order:
             return None
         
         update_data = order_in.model_dump(exclude_unset=True)
+        was_cancelled = db_order.status == OrderStatus.CANCELLED
         for field, value in update_data.items():
             setattr(db_order, field, value)
-        
+
+        # Cancelled orders do not count as sales.
+        is_cancelled = db_order.status == OrderStatus.CANCELLED
+        if is_cancelled != was_cancelled:
+            sales_crud.record_orders(db, [order_id], sign=-1 if is_cancelled else 1)
+
         db.commit()
-        db.refresh(db_order)
+        db_order = self.get(db, order_id)
+        if db_order is not None and "status" in update_data:
+            order_events.publish(OrderStatusEvent(
+                order_id=order_id, status=db_order.status, updated_at=db_order.updated_at
+            ))
         return db_order
 
+    def set_status_many(self, db: Session, order_ids: Sequence[int], status: OrderStatus) -> List[int]:
+        """Move every order in ``order_ids`` that may transition to ``status`` in one UPDATE.
+
+        Orders whose current status does not allow the transition (see
+        ORDER_STATUS_TRANSITIONS) or that do not exist are left alone. Returns
+        the ids that were updated; their updated_at is bumped like any write
+        and each change is published to status subscribers.
+        """
+        updated = db.execute(
+            update(Order)
+            .where(Order.id.in_(set(order_ids)), Order.status.in_(previous_statuses(status)))
+            .values(status=status)
+            .returning(Order.id, Order.updated_at)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        for row in updated:
+            order_events.publish(OrderStatusEvent(order_id=row.id, status=status, updated_at=row.updated_at))
+        return sorted(row.id for row in updated)
+
     def cancel(self, db: Session, order_id: int) -> Optional[Order]:
         db_order = self.get(db, order_id)
         if not db_order:
@@ -80,25 +208,114 @@ class OrderCRUD:
         
         if db_order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
             return None
-        
+
+        # The status check is repeated in the UPDATE so two concurrent cancels
+        # cannot both restock the same order.
+        cancelled = db.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.status.notin_([OrderStatus.DELIVERED, OrderStatus.CANCELLED]))
+            .values(status=OrderStatus.CANCELLED)
+            .returning(Order.status, Order.updated_at)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if cancelled is None:
+            db.rollback()
+            return None
+
+        restock = {}
         for item in db_order.order_items:
-            product = product_crud.get(db, item.product_id)
-            if product:
-                product.stock_quantity += item.quantity
-        
-        db_order.status = OrderStatus.CANCELLED
+            restock[item.product_id] = restock.get(item.product_id, 0) + item.quantity
+        product_crud.release_stock(db, restock)
+        sales_crud.record_orders(db, [order_id], sign=-1)
+
         db.commit()
-        db.refresh(db_order)
+        set_committed_value(db_order, "status", cancelled.status)
+        set_committed_value(db_order, "updated_at", cancelled.updated_at)
+        order_events.publish(OrderStatusEvent(
+            order_id=order_id, status=cancelled.status, updated_at=cancelled.updated_at
+        ))
         return db_order
 
     def delete(self, db: Session, order_id: int) -> bool:
         db_order = self.get(db, order_id)
         if not db_order:
             return False
-        
+
+        if db_order.status != OrderStatus.CANCELLED:
+            sales_crud.record_orders(db, [order_id], sign=-1)
         db.delete(db_order)
         db.commit()
         return True
 
 
-order_crud = OrderCRUD()
\ No newline at end of file
+order_crud = OrderCRUD()
+
+
+class AsyncOrderCRUD:
+    """Async facade over OrderCRUD.
+
+    Responses serialize ``order_items`` on the event loop, where a lazy load
+    would fail (AsyncSession) or block (Session), so keep an eager strategy.
+    """
+
+    async def get(self, db: AnySession, order_id: int, load_items: ItemLoading = "selectin") -> Optional[Order]:
+        return await run_crud(db, order_crud.get, order_id, load_items=load_items)
+
+    async def get_version(self, db: AnySession, order_id: int) -> Optional[Row]:
+        return await run_crud(db, order_crud.get_version, order_id)
+
+    async def get_multi(
+        self, db: AnySession, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, load_items: ItemLoading = "selectin"
+    ) -> List[Order]:
+        return await run_crud(
+            db, order_crud.get_multi,
+            skip=skip, limit=limit, after=after, load_items=load_items
+        )
+
+    async def get_by_user(
+        self, db: AnySession, user_id: int, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, load_items: ItemLoading = "selectin"
+    ) -> List[Order]:
+        return await run_crud(
+            db, order_crud.get_by_user, user_id,
+            skip=skip, limit=limit, after=after, load_items=load_items
+        )
+
+    async def get_by_status(
+        self, db: AnySession, status: OrderStatus, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, load_items: ItemLoading = "selectin"
+    ) -> List[Order]:
+        return await run_crud(
+            db, order_crud.get_by_status, status,
+            skip=skip, limit=limit, after=after, load_items=load_items
+        )
+
+    async def get_rows(
+        self, db: AnySession, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None,
+        user_id: Optional[int] = None, status: Optional[OrderStatus] = None,
+        fields: Optional[Sequence[str]] = None, include_items: bool = True
+    ) -> List[Dict[str, Any]]:
+        return await run_crud(
+            db, order_crud.get_rows,
+            skip=skip, limit=limit, after=after, user_id=user_id, status=status,
+            fields=fields, include_items=include_items
+        )
+
+    async def create(self, db: AnySession, user_id: int, order_in: OrderCreate) -> Optional[Order]:
+        return await run_crud(db, order_crud.create, user_id, order_in)
+
+    async def update(self, db: AnySession, order_id: int, order_in: OrderUpdate) -> Optional[Order]:
+        return await run_crud(db, order_crud.update, order_id, order_in)
+
+    async def set_status_many(self, db: AnySession, order_ids: Sequence[int], status: OrderStatus) -> List[int]:
+        return await run_crud(db, order_crud.set_status_many, order_ids, status)
+
+    async def cancel(self, db: AnySession, order_id: int) -> Optional[Order]:
+        return await run_crud(db, order_crud.cancel, order_id)
+
+    async def delete(self, db: AnySession, order_id: int) -> bool:
+        return await run_crud(db, order_crud.delete, order_id)
+
+
+async_order_crud = AsyncOrderCRUD()
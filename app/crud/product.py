@@ -1,29 +1,204 @@
+import io
+import re
+from collections import defaultdict
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import case, column, func, literal_column, or_, select, table, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import DBAPIError, IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
+from sqlalchemy.sql import Select, TableClause
+from typing import Any, Dict, Iterable, Optional, List, Sequence, Tuple
+from app.database import AnySession, run_crud
+from app.utils.cache import cached_read, catalog_cache, invalidate_on_commit
+from app.crud.catalog import catalog_changed
+from app.utils.export import export_select
+from app.utils.pagination import Cursor, paginate
+from app.utils.projection import partial_schema, schema_columns, select_columns
+from app.utils.bulk_import import Record
+from app.models.category import Category
+from app.models.product import Product, search_document
+from app.schemas.product import (
+    ProductCreate, ProductUpdate, ProductResponse, ProductImportError, ProductImportResult
+)
+
+# Catalog cache namespace (and catalog version) of the product list and
+# search pages; bumped by product writes and by every stock change, since
+# the list pages show stock_quantity.
+CACHE_NAMESPACE = "products"
+
+_LIKE_ESCAPE = re.compile(r"[%_\\]")
+_SEARCH_WORD = re.compile(r"\w+")
+_SEARCH_CANDIDATES = 1000
+
+IMPORT_BATCH_SIZE = 1000
+# Bind parameters per statement; asyncpg allows 32767, SQLite 32766.
+_MAX_BIND_PARAMS = 30000
+# Backslash escapes of COPY's text format.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+# Per-row errors beyond this are counted in ``failed`` but not listed.
+IMPORT_MAX_ERRORS = 1000
+
+# Columns read by the list methods, which return rows rather than entities;
+# their ``fields`` argument narrows the projection further.
+_LIST_COLUMNS = schema_columns(Product, ProductResponse)
+
+
+class DuplicateProductName(ValueError):
+    """A create or update lost the race for a product name to another writer."""
+
+
+def product_namespace(product_id: int) -> str:
+    """Catalog cache namespace of one product's own reads; bumped by any write to it, stock included."""
+    return f"{CACHE_NAMESPACE}:{product_id}"
+
+
+def _invalidate_products(db: Session, product_ids: Iterable[int]) -> None:
+    """Drop the list pages and the given products' own pages at commit."""
+    for product_id in product_ids:
+        invalidate_on_commit(db, catalog_cache, product_namespace(product_id))
+    catalog_changed(db, CACHE_NAMESPACE)
 
 
 class ProductCRUD:
     def get(self, db: Session, product_id: int) -> Optional[Product]:
         return db.query(Product).filter(Product.id == product_id).first()
 
-    def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
-        return db.query(Product).offset(skip).limit(limit).all()
+    def get_version(self, db: Session, product_id: int) -> Optional[str]:
+        """Version of one product for its ETag: its response columns and updated_at, or None if it is gone.
+
+        A one-row primary-key read. The columns themselves are included
+        because SQLite keeps updated_at to the second.
+        """
+        row = db.execute(select(*_LIST_COLUMNS, Product.updated_at).where(Product.id == product_id)).first()
+        return repr(tuple(row)) if row else None
+
+    def get_by_ids(self, db: Session, product_ids: Iterable[int]) -> Dict[int, Product]:
+        """Fetch several products in one query, keyed by id; missing ids are absent."""
+        products = db.query(Product).filter(Product.id.in_(set(product_ids))).all()
+        return {product.id: product for product in products}
+
+    def get_multi(
+        self, db: Session, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        columns = select_columns(_LIST_COLUMNS, fields)
+        return paginate(db.query(*columns), Product, skip, limit, after).all()
+
+    def get_by_category(
+        self, db: Session, category_id: int, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        columns = select_columns(_LIST_COLUMNS, fields)
+        return paginate(db.query(*columns).filter(Product.category_id == category_id), Product, skip, limit, after).all()
+
+    def get_available(
+        self, db: Session, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        columns = select_columns(_LIST_COLUMNS, fields)
+        return paginate(db.query(*columns).filter(Product.is_available == True), Product, skip, limit, after).all()
 
-    def get_by_category(self, db: Session, category_id: int, skip: int = 0, limit: int = 100) -> List[Product]:
-        return db.query(Product).filter(Product.category_id == category_id).offset(skip).limit(limit).all()
+    def export_select(
+        self, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+        category_id: Optional[int] = None
+    ) -> Select:
+        statement = export_select(_LIST_COLUMNS, Product, created_from, created_to)
+        if category_id is not None:
+            statement = statement.where(Product.category_id == category_id)
+        return statement
 
-    def get_available(self, db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
-        return db.query(Product).filter(Product.is_available == True).offset(skip).limit(limit).all()
+    def search(
+        self, db: Session, query: str, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        """Relevance-ranked search over name and description.
 
-    def search(self, db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Product]:
-        return db.query(Product).filter(Product.name.ilike(f"%{query}%")).offset(skip).limit(limit).all()
+        On PostgreSQL this matches the GIN full-text index (every word as a
+        prefix) or the trigram index on ``name`` (substring ILIKE), and ranks
+        by ts_rank plus name similarity. Other backends fall back to a plain
+        ILIKE on ``name``. Pages by offset, since results are not in
+        (created_at, id) order.
+        """
+        columns = select_columns(_LIST_COLUMNS, fields)
+        pattern = "%" + _LIKE_ESCAPE.sub(r"\\\g<0>", query) + "%"
+        name_match = Product.name.ilike(pattern, escape="\\")
+
+        if db.get_bind().dialect.name != "postgresql":
+            return db.query(*columns).filter(name_match).order_by(Product.id).offset(skip).limit(limit).all()
+
+        words = _SEARCH_WORD.findall(query.lower())
+        if not words:
+            rank = func.similarity(Product.name, query)
+            condition = name_match
+        else:
+            tsquery = func.to_tsquery(
+                literal_column("'simple'::regconfig"), " & ".join(f"{word}:*" for word in words)
+            )
+            document = search_document(Product.name, Product.description)
+            rank = func.ts_rank(document, tsquery) + func.similarity(Product.name, query)
+            condition = or_(document.op("@@")(tsquery), name_match)
+
+        # Ranking recomputes the document per row, so only a bounded set of
+        # index matches is ranked; very common terms stay cheap.
+        candidates = db.query(Product.id).filter(condition).limit(_SEARCH_CANDIDATES).subquery()
+        return (
+            db.query(*columns)
+            .join(candidates, Product.id == candidates.c.id)
+            .order_by(rank.desc(), Product.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def reserve_stock(self, db: Session, quantities: Dict[int, int]) -> Dict[int, float]:
+        """Atomically take stock for ``{product_id: quantity}`` without a prior SELECT.
+
+        A single UPDATE decrements every available product that still has
+        enough stock, so concurrent orders cannot oversell and no row is locked
+        beyond the statement's own write. Returns ``{product_id: price}`` for
+        the reserved rows; if some id is missing the caller must roll back.
+        Does not commit.
+        """
+        if not quantities:
+            return {}
+        quantity = case(quantities, value=Product.id)
+        rows = db.execute(
+            update(Product)
+            .where(
+                Product.id.in_(list(quantities)),
+                Product.is_available == True,
+                Product.stock_quantity >= quantity
+            )
+            .values(stock_quantity=Product.stock_quantity - quantity)
+            .returning(Product.id, Product.price)
+            .execution_options(synchronize_session=False)
+        ).all()
+        _invalidate_products(db, (row.id for row in rows))
+        return {row.id: row.price for row in rows}
+
+    def release_stock(self, db: Session, quantities: Dict[int, int]) -> None:
+        """Return stock for ``{product_id: quantity}`` in one UPDATE. Does not commit."""
+        if not quantities:
+            return
+        quantity = case(quantities, value=Product.id)
+        rows = db.execute(
+            update(Product)
+            .where(Product.id.in_(list(quantities)))
+            .values(stock_quantity=Product.stock_quantity + quantity)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        _invalidate_products(db, (row.id for row in rows))
+
+    def get_by_name(self, db: Session, name: str) -> Optional[Product]:
+        return db.query(Product).filter(Product.name == name).first()
 
     def create(self, db: Session, product_in: ProductCreate) -> Product:
         db_product = Product(**product_in.model_dump())
         db.add(db_product)
-        db.commit()
+        _invalidate_products(db, ())
+        self._commit_named(db, product_in.name)
         db.refresh(db_product)
         return db_product
 
@@ -36,18 +211,259 @@ class ProductCRUD:
         for field, value in update_data.items():
             setattr(db_product, field, value)
         
-        db.commit()
+        _invalidate_products(db, (product_id,))
+        self._commit_named(db, update_data.get("name"))
         db.refresh(db_product)
         return db_product
 
+    def _commit_named(self, db: Session, name: Optional[str]) -> None:
+        """Commit a product write, raising DuplicateProductName if ``name`` was taken meanwhile.
+
+        The routes check the name first, but a concurrent writer can claim it
+        between that check and this commit; the unique index then rejects it.
+        """
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            if name is not None and self.get_by_name(db, name) is not None:
+                raise DuplicateProductName(name)
+            raise
+
     def delete(self, db: Session, product_id: int) -> bool:
         db_product = self.get(db, product_id)
         if not db_product:
             return False
         
         db.delete(db_product)
+        _invalidate_products(db, (product_id,))
         db.commit()
         return True
 
+    def import_rows(
+        self, db: Session, records: Iterable[Record], batch_size: int = IMPORT_BATCH_SIZE
+    ) -> ProductImportResult:
+        """Upsert products from parsed feed rows, matching existing products by name.
+
+        Rows are validated against ProductCreate one at a time; a row may name
+        its category by ``category_id`` or by ``category`` (name), resolved
+        against one up-front read of the categories table. Valid rows are
+        written ``batch_size`` at a time as one INSERT ... ON CONFLICT (name)
+        DO UPDATE, which updates only the columns the row supplied, and a
+        commit; the unique name index keeps concurrent imports from creating
+        duplicates. Bad rows, or a batch the database rejects, are reported
+        and the import carries on.
+        """
+        result = ProductImportResult()
+        category_ids = {}
+        for category_id, name in db.execute(select(Category.id, Category.name)):
+            category_ids[name] = category_id
+        known_ids = set(category_ids.values())
+
+        def fail(row_number: int, error: str) -> None:
+            result.failed += 1
+            if len(result.errors) < IMPORT_MAX_ERRORS:
+                result.errors.append(ProductImportError(row=row_number, error=error))
+
+        batch: Dict[str, Tuple[int, ProductCreate]] = {}
+        for row_number, row in records:
+            if isinstance(row, str):
+                fail(row_number, row)
+                continue
+            category = row.pop("category", None)
+            if row.get("category_id") is None and category is not None:
+                row["category_id"] = category_ids.get(category)
+                if row["category_id"] is None:
+                    fail(row_number, f"Unknown category: {category}")
+                    continue
+            try:
+                product_in = ProductCreate.model_validate({k: v for k, v in row.items() if v is not None})
+            except ValidationError as e:
+                fail(row_number, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ))
+                continue
+            if product_in.category_id not in known_ids:
+                fail(row_number, f"Unknown category_id: {product_in.category_id}")
+                continue
+
+            # A later row for the same name replaces an earlier one.
+            batch[product_in.name] = (row_number, product_in)
+            if len(batch) >= batch_size:
+                self._write_import_batch(db, batch, result, fail)
+                batch = {}
+        if batch:
+            self._write_import_batch(db, batch, result, fail)
+        return result
+
+    def _write_import_batch(self, db: Session, batch, result: ProductImportResult, fail) -> None:
+        # Rows are grouped by the columns they supplied, so an update touches
+        # only those; a feed with a fixed header makes a single group.
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+        for _, product_in in batch.values():
+            values = product_in.model_dump(exclude_unset=True)
+            groups[tuple(sorted(values))].append(values)
+
+        try:
+            written: List[Tuple[int, bool]] = []
+            for columns, rows in groups.items():
+                written.extend(self._upsert_import_rows(db, columns, rows))
+            _invalidate_products(db, (product_id for product_id, created in written if not created))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = str(getattr(e, "orig", e)).splitlines()[0]
+            for row_number, _ in batch.values():
+                fail(row_number, f"Database error: {message}")
+            return
+        created = sum(1 for _, created in written if created)
+        result.created += created
+        result.updated += len(written) - created
+
+    def _upsert_import_rows(
+        self, db: Session, columns: Tuple[str, ...], rows: List[Dict[str, Any]]
+    ) -> List[Tuple[int, bool]]:
+        """INSERT ... ON CONFLICT (name) DO UPDATE of rows that all supply ``columns``.
+
+        Returns (id, created) per row. On psycopg2 the rows are COPYed into a
+        temporary table and merged from there; otherwise they are sent as
+        one multi-row VALUES statement (split only past the driver's bind
+        parameter limit).
+        """
+        bind = db.get_bind()
+        insert = postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+        if bind.dialect.driver == "psycopg2":
+            statements = [insert(Product).from_select(columns, select(_copy_to_temp_table(db, columns, rows)))]
+        else:
+            step = _MAX_BIND_PARAMS // len(columns)
+            statements = [insert(Product).values(rows[i:i + step]) for i in range(0, len(rows), step)]
+
+        written: List[Tuple[int, bool]] = []
+        for statement in statements:
+            statement = statement.on_conflict_do_update(
+                index_elements=[Product.name],
+                set_={
+                    **{name: statement.excluded[name] for name in columns if name != "name"},
+                    "updated_at": func.now(),
+                }
+            )
+            # Only the UPDATE branch sets updated_at, which tells the two apart.
+            written.extend(
+                (product_id, updated_at is None)
+                for product_id, updated_at in db.execute(statement.returning(Product.id, Product.updated_at))
+            )
+        return written
+
+
+def _copy_value(value: Any) -> str:
+    """``value`` in COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _copy_to_temp_table(db: Session, columns: Tuple[str, ...], rows: List[Dict[str, Any]]) -> TableClause:
+    """COPY ``rows`` into a temporary table dropped at commit; returns that table."""
+    # One table per column set, as a batch may merge several.
+    mask = sum(1 << i for i, name in enumerate(ProductCreate.model_fields) if name in columns)
+    temp = table(f"product_import_{mask}", *(column(name) for name in columns))
+    names = ", ".join(columns)
+    db.execute(text(f"CREATE TEMPORARY TABLE {temp.name} ON COMMIT DROP AS SELECT {names} FROM products WITH NO DATA"))
+    data = io.StringIO("".join("\t".join(_copy_value(row.get(name)) for name in columns) + "\n" for row in rows))
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {temp.name} ({names}) FROM STDIN", data)
+    except db.get_bind().dialect.dbapi.Error as e:
+        raise DBAPIError(f"COPY {temp.name}", None, e) from e
+    finally:
+        cursor.close()
+    return temp
+
+
+product_crud = ProductCRUD()
+
+
+class AsyncProductCRUD:
+    """Async facade over ProductCRUD.
+
+    Read methods are served from the catalog cache and return
+    ``ProductResponse`` snapshots rather than ORM rows; with ``fields`` the
+    list methods return snapshots of just those fields.
+    """
+
+    async def get(self, db: AnySession, product_id: int) -> Optional[ProductResponse]:
+        return await cached_read(
+            catalog_cache, product_namespace(product_id), "get",
+            lambda: run_crud(db, product_crud.get, product_id),
+            ProductResponse
+        )
+
+    async def get_version(self, db: AnySession, product_id: int) -> Optional[str]:
+        return await run_crud(db, product_crud.get_version, product_id)
+
+    async def get_by_ids(self, db: AnySession, product_ids: Iterable[int]) -> Dict[int, Product]:
+        return await run_crud(db, product_crud.get_by_ids, list(product_ids))
+
+    async def get_multi(
+        self, db: AnySession, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Tuple[str, ...]] = None
+    ) -> List[ProductResponse]:
+        return await cached_read(
+            catalog_cache, CACHE_NAMESPACE, ("get_multi", skip, limit, after, fields),
+            lambda: run_crud(db, product_crud.get_multi, skip=skip, limit=limit, after=after, fields=fields),
+            partial_schema(ProductResponse, fields)
+        )
+
+    async def get_by_category(
+        self, db: AnySession, category_id: int, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Tuple[str, ...]] = None
+    ) -> List[ProductResponse]:
+        return await cached_read(
+            catalog_cache, CACHE_NAMESPACE, ("get_by_category", category_id, skip, limit, after, fields),
+            lambda: run_crud(
+                db, product_crud.get_by_category, category_id, skip=skip, limit=limit, after=after, fields=fields
+            ),
+            partial_schema(ProductResponse, fields)
+        )
+
+    async def get_available(
+        self, db: AnySession, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Tuple[str, ...]] = None
+    ) -> List[ProductResponse]:
+        return await cached_read(
+            catalog_cache, CACHE_NAMESPACE, ("get_available", skip, limit, after, fields),
+            lambda: run_crud(db, product_crud.get_available, skip=skip, limit=limit, after=after, fields=fields),
+            partial_schema(ProductResponse, fields)
+        )
+
+    async def search(
+        self, db: AnySession, query: str, skip: int = 0, limit: int = 100, fields: Optional[Tuple[str, ...]] = None
+    ) -> List[ProductResponse]:
+        return await cached_read(
+            catalog_cache, CACHE_NAMESPACE, ("search", query, skip, limit, fields),
+            lambda: run_crud(db, product_crud.search, query, skip=skip, limit=limit, fields=fields),
+            partial_schema(ProductResponse, fields)
+        )
+
+    async def get_by_name(self, db: AnySession, name: str) -> Optional[Product]:
+        return await run_crud(db, product_crud.get_by_name, name)
+
+    async def create(self, db: AnySession, product_in: ProductCreate) -> Product:
+        return await run_crud(db, product_crud.create, product_in)
+
+    async def update(self, db: AnySession, product_id: int, product_in: ProductUpdate) -> Optional[Product]:
+        return await run_crud(db, product_crud.update, product_id, product_in)
+
+    async def delete(self, db: AnySession, product_id: int) -> bool:
+        return await run_crud(db, product_crud.delete, product_id)
+
+    async def import_rows(
+        self, db: AnySession, records: Iterable[Record], batch_size: int = IMPORT_BATCH_SIZE
+    ) -> ProductImportResult:
+        # ``records`` reads the upload lazily, so it is consumed inside run_crud along with the writes.
+        return await run_crud(db, product_crud.import_rows, records, batch_size=batch_size)
+
 
-product_crud = ProductCRUD()
\ No newline at end of file
+async_product_crud = AsyncProductCRUD()
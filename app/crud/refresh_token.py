@@ -0,0 +1,146 @@
+import hashlib
+import secrets
+import threading
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+from app.config import settings
+from app.database import AnySession, run_crud
+from app.models.refresh_token import RefreshToken
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _expires_at() -> datetime:
+    return _now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+class RefreshTokenCRUD:
+    """Refresh tokens stored in the refresh_tokens table (the default store).
+
+    Only the SHA-256 of each opaque token is kept. Rotation and revocation
+    delete the row, so the table holds live tokens only; expired ones are
+    purged per user on the next login.
+    """
+
+    def issue(self, db: Session, user_id: int) -> str:
+        token = secrets.token_urlsafe(32)
+        db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.expires_at <= _now())
+            .execution_options(synchronize_session=False)
+        )
+        db.add(RefreshToken(user_id=user_id, token_hash=_hash_token(token), expires_at=_expires_at()))
+        db.commit()
+        return token
+
+    def rotate(self, db: Session, token: str) -> Optional[Tuple[int, str]]:
+        """Consume ``token`` and issue its successor; None if it is unknown or expired.
+
+        The unique-index DELETE ... RETURNING both checks and revokes the old
+        token, so two concurrent refreshes cannot both succeed.
+        """
+        user_id = db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.token_hash == _hash_token(token), RefreshToken.expires_at > _now())
+            .returning(RefreshToken.user_id)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if user_id is None:
+            db.rollback()
+            return None
+
+        new_token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(user_id=user_id, token_hash=_hash_token(new_token), expires_at=_expires_at()))
+        db.commit()
+        return user_id, new_token
+
+    def revoke(self, db: Session, token: str) -> bool:
+        revoked = db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.token_hash == _hash_token(token))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return revoked > 0
+
+    def revoke_user(self, db: Session, user_id: int) -> int:
+        revoked = db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return revoked
+
+
+class MemoryRefreshTokenStore:
+    """In-process refresh token store with the RefreshTokenCRUD interface.
+
+    Tokens are lost on restart and not shared between workers; meant for
+    tests and single-process development. ``db`` is accepted and ignored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, Tuple[int, datetime]] = {}
+
+    def issue(self, db: Optional[Session], user_id: int) -> str:
+        token = secrets.token_urlsafe(32)
+        now = _now()
+        with self._lock:
+            for token_hash, (owner, expires_at) in list(self._tokens.items()):
+                if owner == user_id and expires_at <= now:
+                    del self._tokens[token_hash]
+            self._tokens[_hash_token(token)] = (user_id, _expires_at())
+        return token
+
+    def rotate(self, db: Optional[Session], token: str) -> Optional[Tuple[int, str]]:
+        with self._lock:
+            entry = self._tokens.pop(_hash_token(token), None)
+        if entry is None or entry[1] <= _now():
+            return None
+        return entry[0], self.issue(db, entry[0])
+
+    def revoke(self, db: Optional[Session], token: str) -> bool:
+        with self._lock:
+            return self._tokens.pop(_hash_token(token), None) is not None
+
+    def revoke_user(self, db: Optional[Session], user_id: int) -> int:
+        with self._lock:
+            owned = [token_hash for token_hash, (owner, _) in self._tokens.items() if owner == user_id]
+            for token_hash in owned:
+                del self._tokens[token_hash]
+        return len(owned)
+
+
+_STORES = {
+    "db": RefreshTokenCRUD,
+    "memory": MemoryRefreshTokenStore,
+}
+
+refresh_token_crud = _STORES[settings.REFRESH_TOKEN_STORE]()
+
+
+class AsyncRefreshTokenCRUD:
+    async def issue(self, db: AnySession, user_id: int) -> str:
+        return await run_crud(db, refresh_token_crud.issue, user_id)
+
+    async def rotate(self, db: AnySession, token: str) -> Optional[Tuple[int, str]]:
+        return await run_crud(db, refresh_token_crud.rotate, token)
+
+    async def revoke(self, db: AnySession, token: str) -> bool:
+        return await run_crud(db, refresh_token_crud.revoke, token)
+
+    async def revoke_user(self, db: AnySession, user_id: int) -> int:
+        return await run_crud(db, refresh_token_crud.revoke_user, user_id)
+
+
+async_refresh_token_crud = AsyncRefreshTokenCRUD()
@@ -0,0 +1,148 @@
+from datetime import date
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from typing import Any, List, Optional, Sequence
+from app.database import AnySession, run_crud
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.sales import SalesDaily
+
+_ROLLUP_COLUMNS = ["day", "product_id", "category_id", "quantity", "revenue"]
+
+
+def _sale_day(dialect: str) -> Any:
+    """UTC calendar day of Order.created_at."""
+    if dialect == "postgresql":
+        return func.date(func.timezone("UTC", Order.created_at))
+    return func.date(Order.created_at)
+
+
+def _rollup_source(dialect: str, sign: int = 1):
+    """SELECT of rollup rows (day, product, category, quantity, revenue) over order_items."""
+    day = _sale_day(dialect)
+    return (
+        select(
+            day,
+            OrderItem.product_id,
+            Product.category_id,
+            func.sum(OrderItem.quantity) * sign,
+            func.sum(OrderItem.quantity * OrderItem.price) * sign
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(Product, Product.id == OrderItem.product_id)
+        .group_by(day, OrderItem.product_id, Product.category_id)
+    )
+
+
+def _in_range(column: Any, date_from: Optional[date], date_to: Optional[date]) -> List[Any]:
+    conditions = []
+    if date_from is not None:
+        conditions.append(column >= date_from)
+    if date_to is not None:
+        conditions.append(column <= date_to)
+    return conditions
+
+
+class SalesCRUD:
+    """Incrementally maintained sales rollups (sales_daily) and the reports read from them.
+
+    Reports aggregate rollup rows -- at most one per product per day -- so
+    their cost does not grow with the number of orders.
+    """
+
+    def record_orders(self, db: Session, order_ids: Sequence[int], sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) orders' items to the rollup in one upsert.
+
+        Called by OrderCRUD in the same transaction as the order write, so
+        the rollup commits or rolls back with it. Does not commit.
+        """
+        if not order_ids:
+            return
+        dialect = db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        source = _rollup_source(dialect, sign).where(OrderItem.order_id.in_(list(order_ids)))
+        statement = insert(SalesDaily).from_select(_ROLLUP_COLUMNS, source)
+        statement = statement.on_conflict_do_update(
+            index_elements=[SalesDaily.day, SalesDaily.product_id],
+            set_={
+                "quantity": SalesDaily.quantity + statement.excluded.quantity,
+                "revenue": SalesDaily.revenue + statement.excluded.revenue,
+            }
+        )
+        db.execute(statement)
+
+    def rebuild(self, db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+        """Recompute the rollup for ``date_from``..``date_to`` (inclusive) from the orders.
+
+        The compaction job: repairs any drift and drops rows that incremental
+        updates left at zero. Returns the number of rollup rows written. Commits.
+        """
+        dialect = db.get_bind().dialect.name
+        db.execute(delete(SalesDaily).where(*_in_range(SalesDaily.day, date_from, date_to)))
+        source = _rollup_source(dialect).where(
+            Order.status != OrderStatus.CANCELLED, *_in_range(_sale_day(dialect), date_from, date_to)
+        )
+        written = db.execute(SalesDaily.__table__.insert().from_select(_ROLLUP_COLUMNS, source)).rowcount
+        db.commit()
+        return written
+
+    def daily(self, db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> List[Row]:
+        return db.execute(
+            select(
+                SalesDaily.day,
+                func.sum(SalesDaily.quantity).label("quantity"),
+                func.sum(SalesDaily.revenue).label("revenue")
+            )
+            .where(*_in_range(SalesDaily.day, date_from, date_to))
+            .group_by(SalesDaily.day)
+            .order_by(SalesDaily.day)
+        ).all()
+
+    def by_product(
+        self, db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None, limit: int = 100
+    ) -> List[Row]:
+        """Best-selling products by revenue; products whose sales were all cancelled are left out."""
+        revenue = func.sum(SalesDaily.revenue).label("revenue")
+        return db.execute(
+            select(SalesDaily.product_id, func.sum(SalesDaily.quantity).label("quantity"), revenue)
+            .where(*_in_range(SalesDaily.day, date_from, date_to))
+            .group_by(SalesDaily.product_id)
+            .having(func.sum(SalesDaily.quantity) != 0)
+            .order_by(revenue.desc(), SalesDaily.product_id)
+            .limit(limit)
+        ).all()
+
+    def by_category(self, db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> List[Row]:
+        revenue = func.sum(SalesDaily.revenue).label("revenue")
+        return db.execute(
+            select(SalesDaily.category_id, func.sum(SalesDaily.quantity).label("quantity"), revenue)
+            .where(*_in_range(SalesDaily.day, date_from, date_to))
+            .group_by(SalesDaily.category_id)
+            .having(func.sum(SalesDaily.quantity) != 0)
+            .order_by(revenue.desc(), SalesDaily.category_id)
+        ).all()
+
+
+sales_crud = SalesCRUD()
+
+
+class AsyncSalesCRUD:
+    async def daily(
+        self, db: AnySession, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> List[Row]:
+        return await run_crud(db, sales_crud.daily, date_from, date_to)
+
+    async def by_product(
+        self, db: AnySession, date_from: Optional[date] = None, date_to: Optional[date] = None, limit: int = 100
+    ) -> List[Row]:
+        return await run_crud(db, sales_crud.by_product, date_from, date_to, limit=limit)
+
+    async def by_category(
+        self, db: AnySession, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> List[Row]:
+        return await run_crud(db, sales_crud.by_category, date_from, date_to)
+
+
+async_sales_crud = AsyncSalesCRUD()
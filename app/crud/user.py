@@ -1,28 +1,62 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from sqlalchemy.sql import Select
+from datetime import datetime
+from typing import Optional, List, Sequence
+from app.database import AnySession, run_crud
+from app.crud.refresh_token import async_refresh_token_crud
+from app.utils.cache import cached_read, invalidate_on_commit, user_cache
+from app.utils.password_pool import password_pool
+from app.utils.export import export_select
+from app.utils.pagination import Cursor, paginate
+from app.utils.projection import schema_columns, select_columns
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.utils.security import get_password_hash, verify_password
 
+# user_cache namespace for authenticated principals; bumped by user updates and deletes.
+CACHE_NAMESPACE = "principals"
+
+# Columns read by get_multi, which returns rows rather than entities; never hashed_password.
+_LIST_COLUMNS = schema_columns(User, UserResponse)
+
 
 class UserCRUD:
     def get(self, db: Session, user_id: int) -> Optional[User]:
         return db.query(User).filter(User.id == user_id).first()
 
+    def get_principal(self, db: Session, user_id: int) -> Optional[UserResponse]:
+        """The UserResponse columns of a user, without loading the entity or its password hash.
+
+        Built with ``model_construct``: rows are trusted as stored, so a user
+        whose data predates a schema constraint can still authenticate.
+        """
+        row = db.query(*_LIST_COLUMNS).filter(User.id == user_id).first()
+        return UserResponse.model_construct(**row._asdict()) if row else None
+
     def get_by_email(self, db: Session, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
     def get_by_username(self, db: Session, username: str) -> Optional[User]:
         return db.query(User).filter(User.username == username).first()
 
-    def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-        return db.query(User).offset(skip).limit(limit).all()
+    def get_multi(
+        self, db: Session, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        columns = select_columns(_LIST_COLUMNS, fields)
+        return paginate(db.query(*columns), User, skip, limit, after).all()
 
-    def create(self, db: Session, user_in: UserCreate) -> User:
+    def export_select(
+        self, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None
+    ) -> Select:
+        return export_select(_LIST_COLUMNS, User, created_from, created_to)
+
+    def create(self, db: Session, user_in: UserCreate, hashed_password: Optional[str] = None) -> User:
         db_user = User(
             email=user_in.email,
             username=user_in.username,
-            hashed_password=get_password_hash(user_in.password),
+            hashed_password=hashed_password or get_password_hash(user_in.password),
             full_name=user_in.full_name,
             phone=user_in.phone,
             address=user_in.address
@@ -32,7 +66,9 @@ class UserCRUD:
         db.refresh(db_user)
         return db_user
 
-    def update(self, db: Session, user_id: int, user_in: UserUpdate) -> Optional[User]:
+    def update(
+        self, db: Session, user_id: int, user_in: UserUpdate, hashed_password: Optional[str] = None
+    ) -> Optional[User]:
         db_user = self.get(db, user_id)
         if not db_user:
             return None
@@ -40,11 +76,13 @@ class UserCRUD:
         update_data = user_in.model_dump(exclude_unset=True)
         
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            password = update_data.pop("password")
+            update_data["hashed_password"] = hashed_password or get_password_hash(password)
         
         for field, value in update_data.items():
             setattr(db_user, field, value)
         
+        invalidate_on_commit(db, user_cache, CACHE_NAMESPACE)
         db.commit()
         db.refresh(db_user)
         return db_user
@@ -55,6 +93,7 @@ class UserCRUD:
             return False
         
         db.delete(db_user)
+        invalidate_on_commit(db, user_cache, CACHE_NAMESPACE)
         db.commit()
         return True
 
@@ -67,4 +106,65 @@ class UserCRUD:
         return user
 
 
-user_crud = UserCRUD()
\ No newline at end of file
+user_crud = UserCRUD()
+
+
+class AsyncUserCRUD:
+    """Async facade over UserCRUD; bcrypt work runs on the dedicated password_pool."""
+
+    async def get(self, db: AnySession, user_id: int) -> Optional[User]:
+        return await run_crud(db, user_crud.get, user_id)
+
+    async def get_principal(self, db: AnySession, user_id: int) -> Optional[UserResponse]:
+        """Snapshot of the user behind an access token, served from user_cache.
+
+        Any user update or delete invalidates the namespace of the process
+        that commits it. The cache is per process, so other workers may keep
+        serving the old snapshot (is_active and is_admin included) for up to
+        USER_CACHE_TTL seconds.
+        """
+        return await cached_read(
+            user_cache, CACHE_NAMESPACE, user_id,
+            lambda: run_crud(db, user_crud.get_principal, user_id),
+            UserResponse
+        )
+
+    async def get_by_email(self, db: AnySession, email: str) -> Optional[User]:
+        return await run_crud(db, user_crud.get_by_email, email)
+
+    async def get_by_username(self, db: AnySession, username: str) -> Optional[User]:
+        return await run_crud(db, user_crud.get_by_username, username)
+
+    async def get_multi(
+        self, db: AnySession, skip: int = 0, limit: int = 100,
+        after: Optional[Cursor] = None, fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        return await run_crud(db, user_crud.get_multi, skip=skip, limit=limit, after=after, fields=fields)
+
+    async def create(self, db: AnySession, user_in: UserCreate) -> User:
+        hashed_password = await password_pool.hash(user_in.password)
+        return await run_crud(db, user_crud.create, user_in, hashed_password=hashed_password)
+
+    async def update(self, db: AnySession, user_id: int, user_in: UserUpdate) -> Optional[User]:
+        hashed_password = None
+        if user_in.password:
+            hashed_password = await password_pool.hash(user_in.password)
+        user = await run_crud(db, user_crud.update, user_id, user_in, hashed_password=hashed_password)
+        if user and hashed_password:
+            # A new password signs out every other session.
+            await async_refresh_token_crud.revoke_user(db, user_id)
+        return user
+
+    async def delete(self, db: AnySession, user_id: int) -> bool:
+        return await run_crud(db, user_crud.delete, user_id)
+
+    async def authenticate(self, db: AnySession, email: str, password: str) -> Optional[User]:
+        user = await self.get_by_email(db, email)
+        if not user:
+            return None
+        if not await password_pool.verify(password, user.hashed_password):
+            return None
+        return user
+
+
+async_user_crud = AsyncUserCRUD()
@@ -1,19 +1,59 @@
+from typing import Any, Callable, Dict, Type, TypeVar, Union
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.utils.pool_stats import PoolMonitor, async_pool_stats, monitored_pool, sync_pool_stats
+from app.utils.query_stats import instrument
 
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=True
-)
+def _engine_options(url: str, pool_class: Type[QueuePool], monitor: PoolMonitor) -> Dict[str, Any]:
+    """create_engine arguments from Settings, with a pool whose checkouts ``monitor`` times."""
+    options = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # One shared connection per thread; a queue pool would hand out empty databases.
+        return options
+    return {
+        **options,
+        "poolclass": monitored_pool(pool_class, monitor),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL, QueuePool, sync_pool_stats))
+sync_pool_stats.attach(engine)
+instrument(engine)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# The asyncpg engine is only built when the async request path is enabled,
+# so the sync deployment does not need the driver installed.
+async_engine = None
+AsyncSessionLocal = None
+if settings.USE_ASYNC_DB:
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        **_engine_options(settings.async_database_url, AsyncAdaptedQueuePool, async_pool_stats)
+    )
+    async_pool_stats.attach(async_engine.sync_engine)
+    instrument(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
 
 Base = declarative_base()
 
+AnySession = Union[Session, AsyncSession]
+T = TypeVar("T")
+
 
 def get_db():
     db = SessionLocal()
@@ -22,3 +62,36 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the API routes; USE_ASYNC_DB picks the stack.
+get_session = get_async_db if settings.USE_ASYNC_DB else get_db
+
+# Pool that serves the API routes.
+session_pool_stats = async_pool_stats if settings.USE_ASYNC_DB else sync_pool_stats
+
+
+async def close_session(db: AnySession) -> None:
+    """Return ``db``'s connection to the pool now, e.g. before a long-lived response.
+
+    The session stays usable; a later query checks a connection out again.
+    """
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+
+async def run_crud(db: AnySession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a sync CRUD callable against either kind of session without blocking the event loop.
+
+    With an AsyncSession the callable runs through ``AsyncSession.run_sync`` on
+    the asyncpg connection; with a plain Session it runs in the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
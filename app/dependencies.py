@@ -1,36 +1,44 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from typing import Optional
-from app.database import get_db
-from app.models.user import User
-from app.crud.user import user_crud
+from pydantic import BaseModel
+from typing import Callable, Optional, Tuple, Type
+from app.database import AnySession, get_session
+from app.crud.user import async_user_crud
+from app.schemas.user import UserResponse
+from app.utils.pagination import Cursor, decode_cursor
 from app.utils.security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
+async def get_token_principal(db: AnySession, token: str) -> Optional[UserResponse]:
+    """User an access token was issued to, or None if the token is invalid or the user is gone.
+
+    For callers that cannot use the OAuth2 header dependency, e.g. WebSockets.
+    Does not check ``is_active``.
+    """
     payload = decode_access_token(token)
     if payload is None:
-        raise credentials_exception
-    
+        return None
+
     user_id: Optional[int] = payload.get("sub")
     if user_id is None:
-        raise credentials_exception
-    
-    user = user_crud.get(db, user_id=int(user_id))
+        return None
+
+    return await async_user_crud.get_principal(db, user_id=int(user_id))
+
+
+async def get_current_user(
+    db: AnySession = Depends(get_session),
+    token: str = Depends(oauth2_scheme)
+) -> UserResponse:
+    user = await get_token_principal(db, token)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -38,9 +46,9 @@ def get_current_user(
     return user
 
 
-def get_current_active_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_active_admin(
+    current_user: UserResponse = Depends(get_current_user)
+) -> UserResponse:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -48,3 +56,36 @@ def get_current_active_admin(
         )
     return current_user
 
+
+def get_page_cursor(cursor: Optional[str] = None) -> Optional[Cursor]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+
+def field_selector(schema: Type[BaseModel], exclude: Tuple[str, ...] = ()) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """Dependency parsing ``?fields=a,b`` into ``schema`` field names, in schema order."""
+    allowed = [name for name in schema.model_fields if name not in exclude]
+
+    def get_fields(
+        fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(allowed)}")
+    ) -> Optional[Tuple[str, ...]]:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(allowed)
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields requested"
+            )
+        return tuple(name for name in allowed if name in requested)
+
+    return get_fields
@@ -2,5 +2,8 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.product import Product
 from app.models.order import Order, OrderItem
+from app.models.refresh_token import RefreshToken
+from app.models.sales import SalesDaily
+from app.models.catalog import CatalogVersion
 
-__all__ = ["User", "Category", "Product", "Order", "OrderItem"]
\ No newline at end of file
+__all__ = ["User", "Category", "Product", "Order", "OrderItem", "RefreshToken", "SalesDaily", "CatalogVersion"]
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, String
+from app.database import Base
+
+
+class CatalogVersion(Base):
+    """Version of a cached part of the catalog (e.g. the product list pages).
+
+    Bumped in the same transaction as every write to that part (see
+    app/crud/catalog.py), so all workers agree on it; ETags derive from it.
+    """
+    __tablename__ = "catalog_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+from typing import List
 from app.database import Base
 
 
@@ -14,6 +15,23 @@ class OrderStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses an order may move to from each status. Cancelling also restocks,
+# so it goes through OrderCRUD.cancel rather than a plain status change.
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.CONFIRMED, OrderStatus.CANCELLED},
+    OrderStatus.CONFIRMED: {OrderStatus.PREPARING, OrderStatus.CANCELLED},
+    OrderStatus.PREPARING: {OrderStatus.READY, OrderStatus.CANCELLED},
+    OrderStatus.READY: {OrderStatus.DELIVERED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+
+def previous_statuses(status: OrderStatus) -> List[OrderStatus]:
+    """Statuses an order may be in to move to ``status``."""
+    return [source for source, targets in ORDER_STATUS_TRANSITIONS.items() if status in targets]
+
+
 class Order(Base):
     __tablename__ = "orders"
 
@@ -30,6 +48,14 @@ class Order(Base):
     user = relationship("User", back_populates="orders")
     order_items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
+    # Lists and exports page in (created_at, id) order, optionally filtered
+    # by owner or status; each index serves one of those without a sort.
+    __table_args__ = (
+        Index("ix_orders_created", created_at, id),
+        Index("ix_orders_user_created", user_id, created_at, id),
+        Index("ix_orders_status_created", status, created_at, id),
+    )
+
 
 class OrderItem(Base):
     __tablename__ = "order_items"
@@ -42,4 +68,11 @@ class OrderItem(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     order = relationship("Order", back_populates="order_items")
-    product = relationship("Product", back_populates="order_items")
\ No newline at end of file
+    product = relationship("Product", back_populates="order_items")
+
+    __table_args__ = (
+        # Items of a page of orders, in id order.
+        Index("ix_order_items_order_id", order_id, id),
+        # Foreign key checks when a product is deleted.
+        Index("ix_order_items_product_id", product_id),
+    )
\ No newline at end of file
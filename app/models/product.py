@@ -1,14 +1,28 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, DDL, Index, event, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 
+def search_document(name, description):
+    """Full-text document searched by ProductCRUD.search.
+
+    Every literal is inlined so the query expression matches the GIN
+    expression index exactly, whatever the driver's parameter style.
+    """
+    empty = literal_column("''")
+    return func.to_tsvector(
+        literal_column("'simple'::regconfig"),
+        func.coalesce(name, empty) + literal_column("' '") + func.coalesce(description, empty)
+    )
+
+
 class Product(Base):
     __tablename__ = "products"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False, index=True)
+    # Unique: the natural key that supplier imports upsert on.
+    name = Column(String, nullable=False, unique=True, index=True)
     description = Column(Text)
     price = Column(Float, nullable=False)
     image_url = Column(String)
@@ -19,4 +33,35 @@ class Product(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     category = relationship("Category", back_populates="products")
-    order_items = relationship("OrderItem", back_populates="product")
\ No newline at end of file
+    order_items = relationship("OrderItem", back_populates="product")
+
+    __table_args__ = (
+        # List reads in (created_at, id) order: all, by category, available only.
+        Index("ix_products_created", created_at, id),
+        Index("ix_products_category_created", category_id, created_at, id),
+        Index(
+            "ix_products_available_created",
+            created_at,
+            id,
+            postgresql_where=is_available == True,
+            sqlite_where=is_available == True
+        ),
+        Index(
+            "ix_products_search_document",
+            search_document(name, description),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_products_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+event.listen(
+    Product.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Date, Float, Integer
+from app.database import Base
+
+
+class SalesDaily(Base):
+    """Units sold and revenue per UTC day and product, over orders that are not cancelled.
+
+    Derived data: kept current by the order CRUD (see app/crud/sales.py)
+    and recomputable from orders with scripts/rebuild_sales_rollups.py.
+    """
+    __tablename__ = "sales_daily"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+    # Category of the product when it was first sold that day.
+    category_id = Column(Integer, nullable=False, index=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
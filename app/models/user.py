@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -19,4 +19,8 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    orders = relationship("Order", back_populates="user")
\ No newline at end of file
+    orders = relationship("Order", back_populates="user")
+
+    __table_args__ = (
+        Index("ix_users_created", created_at, id),
+    )
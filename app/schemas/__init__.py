@@ -1,11 +1,19 @@
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserLogin
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderItemCreate, OrderItemResponse
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductImportResult
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderItemCreate, OrderItemResponse,
+    OrderStatusBatch, OrderStatusBatchResult, OrderStatusEvent
+)
+from app.schemas.sales import DailySales, ProductSales, CategorySales
+from app.schemas.token import RefreshTokenRequest, TokenResponse
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserLogin",
     "CategoryCreate", "CategoryUpdate", "CategoryResponse",
-    "ProductCreate", "ProductUpdate", "ProductResponse",
-    "OrderCreate", "OrderUpdate", "OrderResponse", "OrderItemCreate", "OrderItemResponse"
+    "ProductCreate", "ProductUpdate", "ProductResponse", "ProductImportResult",
+    "OrderCreate", "OrderUpdate", "OrderResponse", "OrderItemCreate", "OrderItemResponse",
+    "OrderStatusBatch", "OrderStatusBatchResult", "OrderStatusEvent",
+    "DailySales", "ProductSales", "CategorySales",
+    "RefreshTokenRequest", "TokenResponse"
 ]
\ No newline at end of file
@@ -52,3 +52,20 @@ class OrderResponse(OrderBase):
     class Config:
         from_attributes = True
 
+
+
+class OrderStatusBatch(BaseModel):
+    order_ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: OrderStatus
+
+
+class OrderStatusBatchResult(BaseModel):
+    status: OrderStatus
+    updated: List[int] = []
+    skipped: List[int] = []
+
+
+class OrderStatusEvent(BaseModel):
+    order_id: int
+    status: OrderStatus
+    updated_at: Optional[datetime] = None
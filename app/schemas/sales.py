@@ -0,0 +1,29 @@
+from datetime import date
+from pydantic import BaseModel
+
+
+class DailySales(BaseModel):
+    day: date
+    quantity: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
+
+
+class ProductSales(BaseModel):
+    product_id: int
+    quantity: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
+
+
+class CategorySales(BaseModel):
+    category_id: int
+    quantity: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple, Union
+
+# One parsed input row: (line number, field dict) or (line number, error message).
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+FORMATS = ("csv", "jsonl")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """"csv" or "jsonl" from the upload's file name or content type, else None."""
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "jsonl"
+    return None
+
+
+def read_records(file: BinaryIO, format: str) -> Iterator[Record]:
+    """Yield rows of a CSV (with header) or JSON Lines upload one at a time.
+
+    The file is read incrementally, so memory stays flat however large the
+    upload is. Rows that cannot be parsed are yielded as error messages
+    rather than stopping the iteration. Empty CSV cells become None.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        yield from (_read_csv(text) if format == "csv" else _read_jsonl(text))
+    finally:
+        # Leave the upload's file open; its owner closes it.
+        text.detach()
+
+
+def _read_csv(text: io.TextIOBase) -> Iterator[Record]:
+    reader = csv.DictReader(text)
+    try:
+        for row in reader:
+            if None in row:
+                yield reader.line_num, "Too many values"
+                continue
+            yield reader.line_num, {key: value if value != "" else None for key, value in row.items()}
+    except csv.Error as e:
+        yield reader.line_num, f"Malformed CSV: {e}"
+
+
+def _read_jsonl(text: io.TextIOBase) -> Iterator[Record]:
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, row
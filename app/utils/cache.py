@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import settings
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Keys live in namespaces. ``invalidate(namespace)`` bumps the namespace's
+    generation in O(1): older entries become unreachable and age out through
+    LRU eviction. The cache is per process, so with several workers a write
+    is only seen by the other workers once their entries expire.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def _key(self, namespace: str, key: Hashable) -> tuple:
+        return (namespace, self._generations.get(namespace, 0), key)
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            full_key = self._key(namespace, key)
+            entry = self._data.get(full_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[full_key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(full_key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, namespace: str, key: Hashable, value: Any,
+        generation: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        """Store ``value``; pass the ``generation`` read before loading it to drop results that raced a write.
+
+        ``ttl`` can only shorten the cache-wide TTL for this entry.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            current = self._generations.get(namespace, 0)
+            if generation is not None and generation != current:
+                return
+            full_key = (namespace, current, key)
+            self._data[full_key] = (self._clock() + ttl, value)
+            self._data.move_to_end(full_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(self._key(namespace, key), None)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+catalog_cache = TTLCache(maxsize=settings.CATALOG_CACHE_SIZE, ttl=settings.CATALOG_CACHE_TTL)
+
+# Authenticated user principals, keyed by user id.
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# Verified access-token payloads, keyed by the exact token string.
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
+
+def invalidate_on_commit(db: Session, cache: TTLCache, namespace: str) -> None:
+    """Invalidate ``namespace`` of ``cache`` once ``db`` commits; dropped on rollback.
+
+    Invalidating after the commit keeps a concurrent reader from caching rows
+    that are about to change.
+    """
+    db.info.setdefault("cache_invalidate", set()).add((cache, namespace))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(db: Session) -> None:
+    for cache, namespace in db.info.pop("cache_invalidate", ()):
+        cache.invalidate(namespace)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(db: Session, previous_transaction) -> None:
+    db.info.pop("cache_invalidate", None)
+
+
+async def cached_read(
+    cache: TTLCache, namespace: str, key: Hashable, load: Callable[[], Awaitable[Any]], schema: Type[BaseModel]
+) -> Any:
+    """Serve ``key`` from ``cache`` or ``await load()`` and cache its snapshot.
+
+    ORM rows are converted to ``schema`` instances so cached values are
+    detached from any session and safe to share between requests.
+    """
+    generation = cache.generation(namespace)
+    value = cache.get(namespace, key)
+    if value is not None:
+        return value
+
+    result = await load()
+    if result is None:
+        return None
+    if isinstance(result, list):
+        value = [schema.model_validate(row) for row in result]
+    else:
+        value = schema.model_validate(result)
+    cache.set(namespace, key, value, generation=generation)
+    return value
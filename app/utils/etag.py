@@ -0,0 +1,68 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from app.utils.cache import TTLCache
+
+
+def make_etag(data: bytes) -> str:
+    """Strong ETag for ``data`` (a response body or a version string)."""
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists ``etag`` (weak comparison, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, **(headers or {})})
+
+
+async def cached_json(
+    request: Request,
+    cache: TTLCache,
+    namespace: str,
+    version: Callable[[], Awaitable[Optional[Hashable]]],
+    load: Callable[[], Awaitable[Any]],
+    adapter: TypeAdapter,
+    headers: Optional[Callable[[Any], Dict[str, str]]] = None
+) -> Optional[Response]:
+    """Serve ``await load()`` as JSON with an ETag derived from ``await version()``, or 304.
+
+    ``version`` is a cheap read (a counter row, a row's updated_at) that
+    changes with whatever ``load`` returns; the ETag hashes it with the
+    request URL, so it is the same on every worker. A conditional request
+    only reads the version: if If-None-Match matches, the 304 is sent
+    without running ``load`` or serializing. Rendered bodies are cached
+    under the URL with their ETag and any ``headers(value)``: a plain
+    repeat request is served without SQL, and a conditional one reuses the
+    body while its ETag is current. Returns None when ``version`` or
+    ``load`` finds nothing.
+    """
+    key = ("json", request.url.path, request.url.query)
+    generation = cache.generation(namespace)
+    entry = cache.get(namespace, key)
+    if entry is None or request.headers.get("if-none-match"):
+        current = await version()
+        if current is None:
+            return None
+        etag = make_etag(f"{current}|{request.url.path}?{request.url.query}".encode())
+        if entry is None or entry[0] != etag:
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            value = await load()
+            if value is None:
+                return None
+            entry = (etag, adapter.dump_json(value), headers(value) if headers else {})
+            cache.set(namespace, key, entry, generation=generation)
+
+    etag, body, extra_headers = entry
+    if etag_matches(request, etag):
+        return not_modified(etag, extra_headers)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, **extra_headers})
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import time
+from typing import Dict, Optional, Tuple
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.utils.cache import catalog_cache, token_cache, user_cache
+from app.utils.pool_stats import CHECKOUT_BUCKETS, async_pool_stats, sync_pool_stats
+
+# prometheus_client keeps every worker's values in files under this directory
+# when it is set, and /metrics then reports the sum over all workers. It must
+# be a real environment variable (not .env), and emptied before the server starts.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Route label of requests that matched no route, so scanners cannot create series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter("http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request, streamed body included", ["method", "route"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", ["method", "route"], multiprocess_mode="livesum"
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Pool connections by state (checked_out, idle, overflow) and requests waiting for one",
+    ["engine", "state"], multiprocess_mode="livesum"
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["engine"], multiprocess_mode="livesum")
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up after the pool timeout", ["engine"])
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Time to check a connection out of the pool", ["engine"], buckets=CHECKOUT_BUCKETS
+)
+
+CACHE_HITS = Counter("cache_hits_total", "Cache lookups that found a live entry", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache lookups that found no live entry", ["cache"])
+CACHE_ENTRIES = Gauge("cache_entries", "Entries held by the cache", ["cache"], multiprocess_mode="livesum")
+# Per worker (pid label when multiprocess); across workers use the hit and miss counters.
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Hits / lookups since the worker started", ["cache"], multiprocess_mode="liveall")
+
+_CACHES = {"catalog": catalog_cache, "users": user_cache, "tokens": token_cache}
+_POOLS = {"sync": sync_pool_stats, "async": async_pool_stats}
+_POOL_STATES = ("checked_out", "idle", "overflow", "waiting")
+
+
+class _RouteMetrics:
+    """ASGI wrapper that records one route's requests.
+
+    Label children are bound once per method and status and then reused,
+    so handling a request formats no label strings.
+    """
+
+    def __init__(self, app: ASGIApp, route: str):
+        self.app = app
+        self.route = route
+        self._children: Dict[str, Tuple[Gauge, Histogram, Dict[int, Counter]]] = {}
+
+    def _bind(self, method: str) -> Tuple[Gauge, Histogram, Dict[int, Counter]]:
+        children = (REQUESTS_IN_PROGRESS.labels(method, self.route), REQUEST_SECONDS.labels(method, self.route), {})
+        self._children[method] = children
+        return children
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress, duration, statuses = self._children.get(method) or self._bind(method)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except HTTPException as exc:
+            # Rendered further out, e.g. the 404 of a request that matched no route.
+            status_code = exc.status_code
+            raise
+        finally:
+            duration.observe(time.perf_counter() - started)
+            in_progress.dec()
+            requests = statuses.get(status_code)
+            if requests is None:
+                requests = statuses[status_code] = REQUESTS.labels(method, self.route, str(status_code))
+            requests.inc()
+
+
+def instrument_app(app: FastAPI) -> None:
+    """Record request metrics for every route of ``app``, labelled by its path template.
+
+    Call once all routes are added. Each route's ASGI app is wrapped where
+    it is dispatched, so the route is known when the request starts and the
+    in-progress gauge covers the handler. Also starts timing the checkouts
+    of every engine's pool.
+    """
+    for route in app.router.routes:
+        if isinstance(route, APIRoute):
+            route.app = _RouteMetrics(route.app, route.path)
+    app.router.default = _RouteMetrics(app.router.default, UNMATCHED_ROUTE)
+    for name, monitor in _POOLS.items():
+        if monitor.engine is not None:
+            monitor.on_checkout = DB_POOL_CHECKOUT_SECONDS.labels(name).observe
+
+
+class MetricsSampler:
+    """Copies this worker's pool and cache statistics into the metrics.
+
+    They are sampled on every scrape and, with several workers, every
+    ``interval`` seconds as well, since a scrape only reaches one of them.
+    Monotonic totals advance counters by what changed since the last sample.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._totals: Dict[Tuple[str, str], float] = {}
+
+    async def start(self) -> None:
+        if MULTIPROCESS:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if MULTIPROCESS:
+            multiprocess.mark_process_dead(os.getpid())
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def _advance(self, counter: Counter, key: Tuple[str, str], total: float) -> None:
+        delta = total - self._totals.get(key, 0)
+        if delta > 0:
+            counter.inc(delta)
+        self._totals[key] = total
+
+    def sample(self) -> None:
+        for name, monitor in _POOLS.items():
+            if monitor.engine is None:
+                continue
+            summary = monitor.summary()
+            if "size" not in summary:
+                continue
+            DB_POOL_SIZE.labels(name).set(summary["size"])
+            for state in _POOL_STATES:
+                DB_POOL_CONNECTIONS.labels(name, state).set(summary[state])
+            self._advance(DB_POOL_TIMEOUTS.labels(name), ("pool_timeouts", name), summary["timeouts"])
+
+        for name, cache in _CACHES.items():
+            stats = cache.stats()
+            CACHE_ENTRIES.labels(name).set(stats["size"])
+            CACHE_HIT_RATIO.labels(name).set(stats["hit_ratio"])
+            self._advance(CACHE_HITS.labels(name), ("cache_hits", name), stats["hits"])
+            self._advance(CACHE_MISSES.labels(name), ("cache_misses", name), stats["misses"])
+
+
+metrics_sampler = MetricsSampler(interval=settings.METRICS_SAMPLE_INTERVAL)
+
+
+def metrics_response() -> Response:
+    """Prometheus text exposition of every metric (of every worker when multiprocess)."""
+    metrics_sampler.sample()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
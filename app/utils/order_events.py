@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import os
+import re
+import sys
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Optional, Set
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.schemas.order import OrderStatusEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+# ``--workers N`` / ``--workers=N`` (uvicorn, gunicorn) or ``-w N`` (gunicorn)
+# among the NUL-joined command line arguments.
+_WORKERS_ARGUMENT = re.compile(r"(?:^|\0)(?:--workers[=\0]|-w\0?)(\d+)(?:\0|$)")
+
+
+def multiple_workers() -> bool:
+    """Whether this app runs in one of several worker processes.
+
+    Detected from PROMETHEUS_MULTIPROC_DIR (required for metrics with
+    several workers), WEB_CONCURRENCY (the worker count gunicorn and
+    uvicorn read) or a worker count on the server's command line, which
+    uvicorn's and gunicorn's workers inherit. A count set only in a
+    gunicorn config file is not seen.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ or int(os.environ.get("WEB_CONCURRENCY") or 1) > 1:
+        return True
+    workers = _WORKERS_ARGUMENT.search("\0".join(sys.argv[1:]))
+    return workers is not None and int(workers.group(1)) > 1
+
+
+def broker_name() -> str:
+    """ORDER_EVENTS_BROKER, by default postgres on a PostgreSQL database and memory otherwise."""
+    if settings.ORDER_EVENTS_BROKER:
+        return settings.ORDER_EVENTS_BROKER
+    return "postgres" if make_url(settings.DATABASE_URL).get_backend_name() == "postgresql" else "memory"
+
+
+class OrderEventBroker(ABC):
+    """Carries order status events to every process that serves subscribers.
+
+    The hub publishes each event through the broker and delivers what
+    ``listen`` yields to its local subscribers, so a broker shared by all
+    workers lets a client on one worker see a change made on another.
+    """
+
+    async def start(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, event: OrderStatusEvent) -> None:
+        ...
+
+    @abstractmethod
+    def listen(self) -> AsyncIterator[OrderStatusEvent]:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBroker(OrderEventBroker):
+    """In-process broker: events only reach subscribers of the same worker.
+
+    The default on SQLite, for tests and single-worker deployments; refuses
+    to start when several workers are detected (see multiple_workers), since
+    their subscribers would miss events.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+
+    async def start(self) -> None:
+        if multiple_workers():
+            raise RuntimeError(
+                "ORDER_EVENTS_BROKER=memory only reaches subscribers of the same worker; "
+                "use ORDER_EVENTS_BROKER=postgres with several workers"
+            )
+        self._queue = asyncio.Queue()
+
+    async def publish(self, event: OrderStatusEvent) -> None:
+        self._queue.put_nowait(event)
+
+    async def listen(self) -> AsyncIterator[OrderStatusEvent]:
+        while True:
+            yield await self._queue.get()
+
+
+class PostgresBroker(OrderEventBroker):
+    """PostgreSQL LISTEN/NOTIFY on DATABASE_URL: events reach every worker.
+
+    The default when DATABASE_URL is PostgreSQL.
+
+    Each worker holds one asyncpg connection of its own, outside the
+    engine's pool, that LISTENs on ``channel`` and also sends the NOTIFYs,
+    so a worker receives its own events the same way as everyone else's.
+    A lost connection is reopened; events sent while it is down are lost,
+    which subscribers recover from with their next status.
+    """
+
+    channel = "order_events"
+    reconnect_delay = 1.0
+
+    def __init__(self, url: Optional[str] = None):
+        # asyncpg takes a plain libpq URL, whatever driver DATABASE_URL names.
+        url = make_url(url or settings.DATABASE_URL).set(drivername="postgresql")
+        self._dsn = url.render_as_string(hide_password=False)
+        self._connection = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._lock = asyncio.Lock()
+        self._closed = False
+        await self._connect()
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self._dsn)
+        await connection.add_listener(self.channel, self._notified)
+        connection.add_termination_listener(self._terminated)
+        self._connection = connection
+
+    def _notified(self, connection, pid: int, channel: str, payload: str) -> None:
+        self._queue.put_nowait(OrderStatusEvent.model_validate_json(payload))
+
+    def _terminated(self, connection) -> None:
+        if not self._closed:
+            asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        async with self._lock:
+            while not self._closed and (self._connection is None or self._connection.is_closed()):
+                try:
+                    await self._connect()
+                except Exception as e:
+                    logger.warning("Order events connection failed (%s), retrying", e)
+                    await asyncio.sleep(self.reconnect_delay)
+
+    async def publish(self, event: OrderStatusEvent) -> None:
+        # One connection runs one statement at a time.
+        async with self._lock:
+            try:
+                await self._connection.execute("SELECT pg_notify($1, $2)", self.channel, event.model_dump_json())
+            except Exception as e:
+                logger.warning("Order %s status event not sent: %s", event.order_id, e)
+
+    async def listen(self) -> AsyncIterator[OrderStatusEvent]:
+        while True:
+            yield await self._queue.get()
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+_BROKERS = {
+    "memory": MemoryBroker,
+    "postgres": PostgresBroker,
+}
+
+
+class OrderEventHub:
+    """Fans order status events out to this worker's subscribers.
+
+    A subscriber is an asyncio.Queue registered under an order id, so an
+    idle subscription costs one queue and whatever task awaits it; no
+    database connection is held. Publishing is thread-safe and never blocks
+    the caller, so the sync CRUD can publish from the threadpool.
+    """
+
+    def __init__(self, broker: OrderEventBroker, queue_size: int = 8):
+        self.broker = broker
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        # The loop keeps only weak references to tasks; these are the
+        # in-flight broker publishes, each removed when it finishes.
+        self._publishing: Set[asyncio.Task] = set()
+        self.published = 0
+        self.delivered = 0
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self.broker.start()
+        self._task = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.broker.close()
+        self._loop = None
+
+    def publish(self, event: OrderStatusEvent) -> None:
+        """Send ``event`` through the broker; a no-op until the hub is started (e.g. in scripts)."""
+        loop = self._loop
+        if loop is None:
+            return
+        self.published += 1
+        loop.call_soon_threadsafe(self._publish, event)
+
+    def _publish(self, event: OrderStatusEvent) -> None:
+        task = asyncio.get_running_loop().create_task(self.broker.publish(event))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    def subscribe(self, order_id: int) -> asyncio.Queue:
+        """Queue that receives the status events of ``order_id`` until unsubscribed."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[order_id].add(queue)
+        return queue
+
+    def unsubscribe(self, order_id: int, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(order_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[order_id]
+
+    async def _dispatch(self) -> None:
+        async for event in self.broker.listen():
+            for queue in self._subscribers.get(event.order_id, ()):
+                if queue.full():
+                    # A subscriber that fell behind only needs the latest status.
+                    queue.get_nowait()
+                queue.put_nowait(event)
+                self.delivered += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "orders": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+        }
+
+
+order_events = OrderEventHub(_BROKERS[broker_name()]())
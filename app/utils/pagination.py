@@ -0,0 +1,74 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+from fastapi import Response
+from sqlalchemy import String, tuple_
+from sqlalchemy.orm import Query
+
+
+# Decoded keyset position: the (created_at, id) of the last row of a page.
+Cursor = Tuple[datetime, int]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# How SQLite's CURRENT_TIMESTAMP (the created_at server default) stores a timestamp.
+_SQLITE_TIMESTAMP = "%Y-%m-%d %H:%M:%S"
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Decode an opaque cursor; raises ValueError if it was not issued by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def paginate(query: Query, model: Any, skip: int = 0, limit: int = 100, after: Optional[Cursor] = None) -> Query:
+    """Order by (created_at, id) and page either by keyset (``after``) or by offset."""
+    query = query.order_by(model.created_at, model.id)
+    if after is not None:
+        key = tuple_(model.created_at, model.id)
+        query = query.filter(key > _keyset_bound(query, model, after))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def _keyset_bound(query: Query, model: Any, after: Cursor):
+    created_at, id = after
+    if query.session.get_bind().dialect.name != "sqlite":
+        return tuple_(created_at, id, types=[model.created_at.type, model.id.type])
+    # SQLite compares the stored text. DateTime would bind "... HH:MM:SS.000000",
+    # which sorts after every "... HH:MM:SS" row of the same second, so the
+    # bound is written the way CURRENT_TIMESTAMP wrote the row.
+    value = created_at.strftime(_SQLITE_TIMESTAMP)
+    if created_at.microsecond:
+        value += f".{created_at.microsecond:06d}"
+    return tuple_(value, id, types=[String(), model.id.type])
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after ``items`` (objects, rows or dicts), or None when this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
+
+
+def next_cursor_headers(items: Sequence[Any], limit: int) -> Dict[str, str]:
+    cursor = next_cursor(items, limit)
+    return {NEXT_CURSOR_HEADER: cursor} if cursor is not None else {}
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    response.headers.update(next_cursor_headers(items, limit))
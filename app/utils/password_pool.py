@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.utils.security import get_password_hash, verify_password
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password pool already has ``max_pending`` jobs queued or running."""
+
+
+def _timed(fn: Callable, *args) -> tuple:
+    # Runs in the worker process: returns the result with its CPU-side duration.
+    started = time.perf_counter()
+    return fn(*args), time.perf_counter() - started
+
+
+class PasswordPool:
+    """Runs bcrypt hashing and verification on a dedicated process pool.
+
+    bcrypt holds a CPU for ~200ms per call; on the shared threadpool a login
+    burst starves every other route. Here it gets ``workers`` processes of its
+    own and at most ``max_pending`` jobs in flight: beyond that, callers get
+    PasswordPoolBusy straight away instead of queueing behind the storm.
+    With ``workers=0`` the jobs run on the shared threadpool as before
+    (still bounded by ``max_pending``).
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    def start(self) -> None:
+        """Create the worker processes up front so the first login does not pay for it."""
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                for _ in range(self.workers):
+                    self._executor.submit(int)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self.pending += 1
+        if self._executor is None and self.workers > 0:
+            self.start()
+
+        submitted = time.perf_counter()
+        try:
+            if self._executor is not None:
+                loop = asyncio.get_running_loop()
+                result, run_seconds = await loop.run_in_executor(self._executor, _timed, fn, *args)
+            else:
+                result, run_seconds = await run_in_threadpool(_timed, fn, *args)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+                self.failed += 1
+            raise
+
+        wait_seconds = max(0.0, time.perf_counter() - submitted - run_seconds)
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self.wait_seconds += wait_seconds
+            self.run_seconds += run_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self.max_run_seconds = max(self.max_run_seconds, run_seconds)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "avg_wait_ms": self.wait_seconds / done * 1000,
+                "avg_run_ms": self.run_seconds / done * 1000,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "max_run_ms": self.max_run_seconds * 1000,
+            }
+
+
+password_pool = PasswordPool(workers=settings.PASSWORD_POOL_WORKERS, max_pending=settings.PASSWORD_POOL_MAX_PENDING)
@@ -0,0 +1,164 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Type
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import Pool, QueuePool
+
+# Upper bounds, in seconds, of the checkout latency histogram buckets.
+CHECKOUT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus style); not thread-safe on its own."""
+
+    def __init__(self, buckets: Sequence[float] = CHECKOUT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative counts keyed by upper bound ("+Inf" last), with sum and count."""
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class PoolMonitor:
+    """Live statistics of one engine's connection pool.
+
+    Checkouts are timed by the pool class from ``monitored_pool``; new
+    and invalidated connections are counted through pool events.
+    A checkout that finds no idle connection and no overflow headroom has
+    to wait for another request to return one: those are counted as
+    waits, and the ones that give up after ``pool_timeout`` as timeouts.
+    """
+
+    def __init__(self, name: str, buckets: Sequence[float] = CHECKOUT_BUCKETS):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self.checkout_latency = Histogram(buckets)
+        self.waiting = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        # Also called with every successful checkout's latency, e.g. by app.utils.metrics.
+        self.on_checkout: Optional[Callable[[float], None]] = None
+
+    def attach(self, engine: Engine) -> None:
+        self.engine = engine
+        # Pool events carry over to the pool Engine.dispose() recreates.
+        event.listen(engine.pool, "connect", self._on_connect)
+        event.listen(engine.pool, "invalidate", self._on_invalidate)
+
+    @property
+    def pool(self) -> Optional[Pool]:
+        return self.engine.pool if self.engine is not None else None
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def checkout_started(self, saturated: bool) -> None:
+        if saturated:
+            with self._lock:
+                self.waiting += 1
+
+    def checkout_finished(self, seconds: float, saturated: bool, timed_out: bool = False) -> None:
+        with self._lock:
+            if saturated:
+                self.waiting -= 1
+                self.waits += 1
+                self.wait_seconds += seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkout_latency.observe(seconds)
+        if self.on_checkout is not None and not timed_out:
+            self.on_checkout(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        """Current occupancy of the pool; cheap enough for the health check."""
+        pool = self.pool
+        if not isinstance(pool, QueuePool):
+            return {"pool": type(pool).__name__ if pool is not None else None}
+        with self._lock:
+            waiting, timeouts = self.waiting, self.timeouts
+        return {
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "waiting": waiting,
+            "timeouts": timeouts,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        summary = self.summary()
+        with self._lock:
+            checkouts = self.checkout_latency.count
+            return {
+                **summary,
+                "timeout": getattr(self.pool, "_timeout", None),
+                "checkouts": checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "waits": self.waits,
+                "avg_wait_ms": self.wait_seconds / (self.waits or 1) * 1000,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "avg_checkout_ms": self.checkout_latency.sum / (checkouts or 1) * 1000,
+                "checkout_latency": self.checkout_latency.snapshot(),
+            }
+
+
+class _MonitoredCheckout:
+    monitor: PoolMonitor
+
+    def connect(self):
+        saturated = self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+        self.monitor.checkout_started(saturated)
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeout:
+            self.monitor.checkout_finished(time.perf_counter() - started, saturated, timed_out=True)
+            raise
+        except BaseException:
+            self.monitor.checkout_finished(time.perf_counter() - started, saturated)
+            raise
+        self.monitor.checkout_finished(time.perf_counter() - started, saturated)
+        return connection
+
+
+def monitored_pool(pool_class: Type[QueuePool], monitor: PoolMonitor) -> Type[QueuePool]:
+    """``pool_class`` with every checkout timed into ``monitor``.
+
+    The monitor is a class attribute, so it carries over to the pools that
+    Engine.dispose() and invalidation recreate from the same class.
+    """
+    return type(f"Monitored{pool_class.__name__}", (_MonitoredCheckout, pool_class), {"monitor": monitor})
+
+
+# Statistics of the psycopg2 engine and, when USE_ASYNC_DB is on, the asyncpg one.
+sync_pool_stats = PoolMonitor("sync")
+async_pool_stats = PoolMonitor("async")
@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple, Type
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+
+# Always selected, even when not requested: keyset pagination and the
+# order-items join need them.
+KEY_FIELDS = ("id", "created_at")
+
+
+def schema_columns(model: Any, schema: Type[BaseModel]) -> List[Any]:
+    """Columns of ``model`` that back ``schema``'s fields, in field order.
+
+    List reads select these instead of the entity: the result is plain Row
+    tuples with no identity map or change tracking, and columns the schema
+    does not expose are never fetched. Nested fields are skipped.
+    """
+    columns = model.__table__.c
+    return [getattr(model, name) for name in schema.model_fields if name in columns]
+
+
+def select_columns(columns: List[Any], fields: Optional[Sequence[str]]) -> List[Any]:
+    """``columns`` narrowed to ``fields`` plus KEY_FIELDS; all of them when ``fields`` is None."""
+    if fields is None:
+        return columns
+    keep = set(fields).union(KEY_FIELDS)
+    return [column for column in columns if column.key in keep]
+
+
+@lru_cache(maxsize=256)
+def partial_schema(schema: Type[BaseModel], fields: Optional[Tuple[str, ...]]) -> Type[BaseModel]:
+    """``schema`` restricted to ``fields`` (same types and serialization); ``schema`` itself for None.
+
+    KEY_FIELDS that were not requested are kept on the instances, for the
+    next-page cursor, but left out of the output.
+    """
+    if fields is None:
+        return schema
+    definitions = {}
+    for name, field in schema.model_fields.items():
+        if name in fields:
+            definitions[name] = (field.annotation, field)
+        elif name in KEY_FIELDS:
+            definitions[name] = (field.annotation, Field(exclude=True))
+    return create_model(schema.__name__, __config__=ConfigDict(from_attributes=True), **definitions)
+
+
+@lru_cache(maxsize=256)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
@@ -0,0 +1,152 @@
+import logging
+import sys
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+access_logger = logging.getLogger("app.access")
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# Frames of these modules are skipped when naming a slow statement's caller.
+_PLUMBING_MODULES = (__name__, "app.database")
+
+
+class QueryStats:
+    """SQL statements executed, and the time spent in them, while serving one request."""
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request being served, or None outside a request (scripts, WebSockets)."""
+    return _current.get()
+
+
+def instrument(engine: Engine) -> None:
+    """Count ``engine``'s statements into the current request's stats and log slow ones.
+
+    For an AsyncEngine pass its ``sync_engine``. The context variable follows
+    the request into the threadpool and into AsyncSession.run_sync, so both
+    session stacks are counted.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _record(conn, statement, parameters)
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        _record(conn, exception_context.statement, exception_context.parameters)
+
+
+def _record(conn, statement: Optional[str], parameters: Any) -> None:
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
+    if 0 < settings.SLOW_QUERY_MS <= seconds * 1000:
+        slow_query_logger.warning(orjson.dumps({
+            "duration_ms": round(seconds * 1000, 2),
+            "caller": _caller(),
+            "statement": " ".join((statement or "").split()),
+            "parameters": _shape(parameters),
+        }).decode())
+
+
+def _shape(parameters: Any) -> Any:
+    """Parameter names and types without their values, which may be personal data."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: one shape for the whole batch
+            return {"rows": len(parameters), "row": _shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _caller() -> Optional[str]:
+    """Innermost application function (a CRUD method, usually) on the stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        code = frame.f_code
+        # Comprehensions and lambdas are attributed to the function around them.
+        if module.startswith("app.") and module not in _PLUMBING_MODULES and not code.co_name.startswith("<"):
+            return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return None
+
+
+class QueryStatsMiddleware:
+    """Tracks each HTTP request's SQL and reports it.
+
+    The statement count and DB time so far go into a ``Server-Timing``
+    header (``db`` and ``app`` metrics) when the response starts; once the
+    body is sent, one JSON line per request goes to the ``app.access`` log.
+    Statements a streamed body runs after the headers are only in the log.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - started
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.2f};desc="{stats.statements} statements", '
+                    f"app;dur={elapsed * 1000:.2f}"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if settings.ACCESS_LOG:
+                route = scope.get("route")
+                access_logger.info(orjson.dumps({
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "db_statements": stats.statements,
+                    "db_ms": round(stats.seconds * 1000, 2),
+                }).decode())
@@ -0,0 +1,17 @@
+from typing import Any, Dict, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def render_json(
+    adapter: TypeAdapter, value: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Render ORM rows or schema instances through a precompiled TypeAdapter.
+
+    Validation from attributes and JSON encoding both run in pydantic-core,
+    skipping FastAPI's per-request response_model pass (validate, convert to
+    jsonable Python, then encode). Keep ``response_model`` on the route so the
+    OpenAPI schema is unchanged.
+    """
+    body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
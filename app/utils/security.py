@@ -1,8 +1,13 @@
+import time
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from app.config import settings
+from app.utils.cache import token_cache
+
+# token_cache namespace for verified access-token payloads.
+TOKEN_CACHE_NAMESPACE = "access"
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -29,10 +34,23 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode a JWT access token."""
+    """Decode a JWT access token.
+
+    Verified payloads are cached under the exact token string until the
+    token's ``exp`` (or TOKEN_CACHE_TTL, whichever comes first), so a hit
+    only ever returns the result of verifying that same token.
+    """
+    payload = token_cache.get(TOKEN_CACHE_NAMESPACE, token)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(TOKEN_CACHE_NAMESPACE, token, dict(payload), ttl=exp - time.time())
+    return payload
+
@@ -1,18 +1,29 @@
+import logging
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeout
 
-from app.database import engine, Base
+from app.database import engine, Base, session_pool_stats
 from app.api.routes import api_router
 from app.config import settings
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.order_events import order_events
+from app.utils.password_pool import PasswordPoolBusy, password_pool
+from app.utils.query_stats import QueryStatsMiddleware
+from app.utils.metrics import instrument_app, metrics_response, metrics_sampler
 
 
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="Coffee Shop"
+    description="Coffee Shop",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -21,11 +32,61 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+@app.on_event("startup")
+def start_password_pool():
+    password_pool.start()
+
+
+@app.on_event("shutdown")
+def stop_password_pool():
+    password_pool.shutdown()
+
+
+@app.on_event("startup")
+async def start_order_events():
+    await order_events.start()
+
+
+@app.on_event("shutdown")
+async def stop_order_events():
+    await order_events.stop()
+
+
+@app.on_event("startup")
+async def start_metrics_sampler():
+    await metrics_sampler.start()
+
+
+@app.on_event("shutdown")
+async def stop_metrics_sampler():
+    await metrics_sampler.stop()
+
+
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many authentication requests, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database busy, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 def root():
     return {
@@ -38,7 +99,15 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "db_pool": session_pool_stats.summary()}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return metrics_response()
+
+    instrument_app(app)
 
 
 if __name__ == "__main__":
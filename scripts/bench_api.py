@@ -0,0 +1,375 @@
+"""
+Load benchmark of the API with the coffee shop's real request mix.
+
+Against a running API instance, --users virtual users (threads, each with
+its own keep-alive connection) repeatedly pick an action by weight:
+
+    browse   anonymous menu: categories, a product page, a catalog page
+    search   anonymous catalog search
+    login    customer login (bcrypt)
+    order    customer places an order of 1-3 products
+    poll     customer re-reads one of their orders with If-None-Match
+    status   admin moves up to 10 orders one step along the status flow
+
+Customers log in once before the run. The first --warmup seconds are not
+recorded. The report gives, per endpoint, the request count, errors,
+throughput and p50/p95/p99 latency. With --output it is also saved as JSON
+with the git commit it ran against, and --compare prints the change against
+an earlier JSON report, so runs can be diffed between commits.
+
+The script seeds its users and products through DATABASE_URL, which must
+point at the database the server uses. The client shares the machine with
+the server, so compare runs made on the same machine with the same options.
+
+Usage:
+    python -m scripts.bench_api --users 16 --duration 60 --output before.json
+    python -m scripts.bench_api --users 16 --duration 60 --compare before.json
+    OR
+    python scripts/bench_api.py --base-url http://127.0.0.1:8000 (from project root)
+"""
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.models import Category, Product, User
+from app.models.order import OrderStatus
+from app.utils.security import get_password_hash
+
+PASSWORD = "bench123"
+ADMIN_EMAIL = "bench-admin@coffeeshop.com"
+CATEGORY = "Benchmark"
+DRINKS = ["Espresso", "Latte", "Cappuccino", "Flat White", "Mocha", "Americano", "Cold Brew", "Matcha Latte"]
+
+# Relative weight of each action in the mix.
+MIX = {"browse": 50, "search": 10, "login": 5, "order": 10, "poll": 20, "status": 5}
+
+# Statuses the admin action moves orders through, one step per request.
+STATUS_FLOW = [OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY, OrderStatus.DELIVERED]
+
+
+def prepare(customers: int, products: int):
+    """Create the admin, ``customers`` customers and ``products`` products; returns (emails, category id, product ids)."""
+    Base.metadata.create_all(bind=engine)
+
+    db: Session = SessionLocal()
+    try:
+        hashed = get_password_hash(PASSWORD)
+        emails = [f"bench{i}@coffeeshop.com" for i in range(customers)]
+        existing = {email for (email,) in db.query(User.email).filter(User.email.in_(emails + [ADMIN_EMAIL]))}
+        if ADMIN_EMAIL not in existing:
+            db.add(User(email=ADMIN_EMAIL, username="bench-admin", hashed_password=hashed, is_admin=True))
+        db.add_all(
+            User(email=email, username=email.split("@")[0], hashed_password=hashed, full_name="Bench Customer")
+            for email in emails if email not in existing
+        )
+
+        category = db.query(Category).filter(Category.name == CATEGORY).first()
+        if not category:
+            category = Category(name=CATEGORY)
+            db.add(category)
+            db.flush()
+        have = db.query(Product.id).filter(Product.category_id == category.id).count()
+        db.add_all(
+            Product(
+                name=f"{DRINKS[i % len(DRINKS)]} {i}", description="Benchmark drink", price=2 + i % 5,
+                stock_quantity=1_000_000_000, category_id=category.id
+            )
+            for i in range(have, products)
+        )
+        db.commit()
+        product_ids = [id for (id,) in db.query(Product.id).filter(Product.category_id == category.id)]
+        return emails, category.id, product_ids
+    finally:
+        db.close()
+
+
+class Client:
+    """One keep-alive HTTP connection; records every request under an endpoint label."""
+
+    def __init__(self, base_url: str, recorder: "Recorder"):
+        url = urllib.parse.urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.prefix = url.path.rstrip("/") + settings.API_V1_PREFIX
+        self.recorder = recorder
+        self.connection: Optional[http.client.HTTPConnection] = None
+
+    def request(self, label: str, method: str, path: str, body: bytes = None, headers: Dict[str, str] = None):
+        """(status, response headers, body); status 0 if the connection failed."""
+        started = time.perf_counter()
+        try:
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            self.connection.request(method, self.prefix + path, body=body, headers=headers or {})
+            response = self.connection.getresponse()
+            status, data = response.status, response.read()
+            result = status, response.headers, data
+        except (OSError, http.client.HTTPException):
+            if self.connection is not None:
+                self.connection.close()
+            self.connection = None
+            status, result = 0, (0, {}, b"")
+        self.recorder.record(label, status, time.perf_counter() - started)
+        return result
+
+    def json(self, label: str, method: str, path: str, payload, token: str = None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return self.request(label, method, path, json.dumps(payload).encode(), headers)
+
+    def login(self, email: str) -> Optional[str]:
+        body = urllib.parse.urlencode({"username": email, "password": PASSWORD}).encode()
+        status, _, data = self.request(
+            "POST /auth/login", "POST", "/auth/login", body, {"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        return json.loads(data)["access_token"] if status == 200 else None
+
+
+class Recorder:
+    """Latencies and status codes per endpoint label; ignores requests made before ``start``."""
+
+    def __init__(self):
+        self.start = float("inf")
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, label: str, status: int, seconds: float) -> None:
+        if time.perf_counter() < self.start:
+            return
+        with self._lock:
+            self.latencies[label].append(seconds * 1000)
+            self.statuses[label][status] += 1
+            # 304 is a successful conditional poll; 0 is a failed connection.
+            if status == 0 or status >= 400:
+                self.errors[label] += 1
+
+
+class OrderBoard:
+    """Orders placed during the run, queued by status for the admin to advance."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = [deque() for _ in range(len(STATUS_FLOW))]
+
+    def placed(self, order_id: int) -> None:
+        with self._lock:
+            self._stages[0].append(order_id)
+
+    def take(self, batch: int):
+        """(next status, order ids) of the most advanced non-empty stage, or None."""
+        with self._lock:
+            for stage in reversed(range(len(self._stages))):
+                queue = self._stages[stage]
+                if queue:
+                    ids = [queue.popleft() for _ in range(min(batch, len(queue)))]
+                    if stage + 1 < len(self._stages):
+                        self._stages[stage + 1].extend(ids)
+                    return STATUS_FLOW[stage], ids
+        return None
+
+
+def virtual_user(client: Client, email: str, admin_token: str, category_id: int, product_ids: List[int],
+                 board: OrderBoard, deadline: float, seed: int):
+    rng = random.Random(seed)
+    token = client.login(email)
+    own_orders: List[int] = []
+    etags: Dict[int, str] = {}
+    actions, weights = list(MIX), list(MIX.values())
+
+    while time.perf_counter() < deadline:
+        action = rng.choices(actions, weights)[0]
+        if action == "browse":
+            client.request("GET /categories/", "GET", "/categories/")
+            client.request("GET /products/", "GET", f"/products/?category_id={category_id}&limit=20")
+            client.request("GET /products/{id}", "GET", f"/products/{rng.choice(product_ids)}")
+        elif action == "search":
+            word = rng.choice(DRINKS).split()[0].lower()
+            client.request("GET /products/?search", "GET", f"/products/?search={word}&limit=20")
+        elif action == "login":
+            token = client.login(email) or token
+        elif action == "order" or (action == "poll" and not own_orders):
+            items = [{"product_id": id, "quantity": 1} for id in rng.sample(product_ids, rng.randint(1, 3))]
+            status, _, data = client.json(
+                "POST /orders/", "POST", "/orders/",
+                {"delivery_address": "Benchmark street 1", "phone": "+10000000000", "items": items}, token
+            )
+            if status == 201:
+                order_id = json.loads(data)["id"]
+                own_orders.append(order_id)
+                board.placed(order_id)
+        elif action == "poll":
+            order_id = rng.choice(own_orders[-5:])
+            headers = {"Authorization": f"Bearer {token}"}
+            if order_id in etags:
+                headers["If-None-Match"] = etags[order_id]
+            status, response_headers, _ = client.request("GET /orders/{id}", "GET", f"/orders/{order_id}", headers=headers)
+            if status == 200 and response_headers.get("ETag"):
+                etags[order_id] = response_headers["ETag"]
+        elif action == "status":
+            batch = board.take(10)
+            if batch is not None:
+                status, ids = batch
+                client.json("POST /orders/status", "POST", "/orders/status", {"order_ids": ids, "status": status.value}, admin_token)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted ``samples``."""
+    return samples[min(len(samples) - 1, max(0, int(round(q / 100 * len(samples))) - 1))]
+
+
+def summarize(recorder: Recorder, seconds: float) -> Dict[str, Dict[str, float]]:
+    endpoints = {}
+    for label in sorted(recorder.latencies):
+        samples = sorted(recorder.latencies[label])
+        endpoints[label] = {
+            "requests": len(samples),
+            "errors": recorder.errors[label],
+            "throughput_rps": round(len(samples) / seconds, 2),
+            "mean_ms": round(sum(samples) / len(samples), 2),
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+            "max_ms": round(samples[-1], 2),
+            "statuses": {str(code): count for code, count in sorted(recorder.statuses[label].items())},
+        }
+    return endpoints
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent.parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, baseline: Optional[dict]):
+    print(f"\n{'endpoint':<24}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for label, row in {**report["endpoints"], "total": report["total"]}.items():
+        print(
+            f"{label:<24}{row['requests']:>9}{row['errors']:>8}{row['throughput_rps']:>9.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+        )
+    if baseline is None:
+        return
+
+    print(f"\nChange against {baseline['meta'].get('commit')} ({baseline['meta']['started_at']}):")
+    print(f"{'endpoint':<24}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    old_rows = {**baseline["endpoints"], "total": baseline["total"]}
+    for label, row in {**report["endpoints"], "total": report["total"]}.items():
+        old = old_rows.get(label)
+        if old is None:
+            continue
+        changes = [
+            f"{(row[key] - old[key]) / old[key] * 100:>+9.1f}%" if old[key] else f"{'n/a':>10}"
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(f"{label:<24}{''.join(changes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Recorded seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unrecorded seconds before the run")
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Save the report as JSON")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+
+    engine.echo = False
+    emails, category_id, product_ids = prepare(args.users, args.products)
+    recorder = Recorder()
+    admin_token = Client(args.base_url, recorder).login(ADMIN_EMAIL)
+    if admin_token is None:
+        print("[ERROR] Admin login failed; is the API running against DATABASE_URL?")
+        sys.exit(1)
+
+    print(f"[INFO] {args.users} users, {args.warmup:.0f}s warm-up + {args.duration:.0f}s, mix {MIX}")
+    board = OrderBoard()
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    begin = time.perf_counter()
+    deadline = begin + args.warmup + args.duration
+    # Each user's first login falls in the warm-up, so only its later logins are recorded.
+    recorder.start = begin + args.warmup
+    threads = [
+        threading.Thread(
+            target=virtual_user,
+            args=(Client(args.base_url, recorder), email, admin_token, category_id, product_ids, board, deadline, args.seed + i),
+            daemon=True
+        )
+        for i, email in enumerate(emails)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - recorder.start
+
+    endpoints = summarize(recorder, seconds)
+    if not endpoints:
+        print("[ERROR] No requests recorded; is the API running?")
+        sys.exit(1)
+    all_samples = sorted(latency for samples in recorder.latencies.values() for latency in samples)
+    total = {
+        "requests": len(all_samples),
+        "errors": sum(recorder.errors.values()),
+        "throughput_rps": round(len(all_samples) / seconds, 2),
+        "mean_ms": round(sum(all_samples) / len(all_samples), 2),
+        "p50_ms": round(percentile(all_samples, 50), 2),
+        "p95_ms": round(percentile(all_samples, 95), 2),
+        "p99_ms": round(percentile(all_samples, 99), 2),
+        "max_ms": round(all_samples[-1], 2),
+    }
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at,
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration_s": round(seconds, 2),
+            "warmup_s": args.warmup,
+            "products": len(product_ids),
+            "seed": args.seed,
+            "mix": MIX,
+        },
+        "endpoints": endpoints,
+        "total": total,
+    }
+
+    print_report(report, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\n[INFO] Report saved to {args.output}")
+    if total["errors"]:
+        print(f"[ERROR] {total['errors']} requests failed; see the status codes in the report")
+    print("[SUCCESS] Done")
+
+
+if __name__ == "__main__":
+    main()
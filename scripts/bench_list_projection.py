@@ -0,0 +1,138 @@
+"""
+Benchmark column-projected list reads against loading full ORM entities.
+
+Builds a scratch schema (bench_lists) in the configured PostgreSQL database
+with synthetic products (with long descriptions) and orders with items, then
+for each page size times and measures the peak Python memory of:
+
+    entities  db.query(Model) page, validated and rendered to JSON
+    rows      the CRUD list method (projected columns), rendered the same way
+
+The scratch schema is dropped at the end; application tables are not touched.
+
+Usage:
+    python -m scripts.bench_list_projection --rows 10000 --sizes 100 1000 10000
+    OR
+    python scripts/bench_list_projection.py (from project root)
+"""
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.database import engine, Base
+from app.models import Category, Order, OrderItem, Product, User
+from app.crud.order import order_crud
+from app.crud.product import product_crud
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+from app.utils.pagination import paginate
+from app.utils.responses import render_json
+
+SCHEMA = "bench_lists"
+
+
+def populate(conn, rows: int):
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.products (name, description, price, is_available, stock_quantity, category_id)
+        SELECT 'Drink ' || g, repeat('Long menu description. ', 80), 100 + g % 500, true, 100, 1
+        FROM generate_series(1, :rows) AS g
+        """
+    ), {"rows": rows})
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.orders (user_id, status, total_amount, delivery_address, phone, notes)
+        SELECT 1, 'PENDING', 30, 'Benchmark street ' || g, '+10000000000', 'Ring twice'
+        FROM generate_series(1, :rows) AS g
+        """
+    ), {"rows": rows})
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.order_items (order_id, product_id, quantity, price)
+        SELECT o.id, 1 + (o.id * 7 + n) % :rows, 1 + n, 10
+        FROM {SCHEMA}.orders AS o, generate_series(0, 2) AS n
+        """
+    ), {"rows": rows})
+    for table in ("products", "orders", "order_items"):
+        conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+
+def measure(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples), peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("[ERROR] The projection benchmark needs PostgreSQL (DATABASE_URL)")
+        sys.exit(1)
+    engine.echo = False
+
+    tables = [User.__table__, Category.__table__, Product.__table__, Order.__table__, OrderItem.__table__]
+    products = TypeAdapter(List[ProductResponse])
+    orders = TypeAdapter(List[OrderResponse])
+
+    with engine.connect() as raw:
+        conn = raw.execution_options(schema_translate_map={None: SCHEMA})
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        Base.metadata.create_all(conn, tables=tables)
+        conn.execute(User.__table__.insert().values(id=1, email="bench@x", username="bench", hashed_password="x"))
+        conn.execute(Category.__table__.insert().values(id=1, name="Benchmark"))
+        populate(conn, args.rows)
+        conn.commit()
+        print(f"[INFO] {args.rows} products and orders loaded; median of {args.repeat} runs, peak traced memory")
+
+        def fresh(read, adapter):
+            def run():
+                with Session(bind=conn) as db:
+                    render_json(adapter, read(db))
+            return run
+
+        cases = {
+            "products": (
+                lambda size: fresh(lambda db: paginate(db.query(Product), Product, limit=size).all(), products),
+                lambda size: fresh(lambda db: product_crud.get_multi(db, limit=size), products),
+            ),
+            "orders": (
+                lambda size: fresh(lambda db: order_crud.get_multi(db, limit=size), orders),
+                lambda size: fresh(lambda db: order_crud.get_rows(db, limit=size), orders),
+            ),
+        }
+        for name, (entities, rows) in cases.items():
+            print(f"\n{name:<10}{'entities':>24}{'rows':>24}")
+            for size in args.sizes:
+                cells = [measure(make(size), args.repeat) for make in (entities, rows)]
+                print(f"{size:<10}" + "".join(f"{ms:>10.1f}ms {mib:>8.1f}MiB" for ms, mib in cells))
+
+        conn.rollback()
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        conn.commit()
+    print("\n[SUCCESS] Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Latency benchmark for catalog reads during a login storm.
+
+Measures GET /products/ latency against a running API instance, first on its
+own and then while many concurrent clients keep logging in. Reports p50/p99
+of the catalog reads for both phases and the status-code mix of the logins
+(503 means the password pool shed the request).
+
+Usage:
+    python -m scripts.bench_login_storm --duration 20 --login-concurrency 64
+    OR
+    python scripts/bench_login_storm.py --base-url http://127.0.0.1:8000 (from project root)
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.models import User
+from app.utils.security import get_password_hash
+
+EMAIL = "storm@coffeeshop.com"
+PASSWORD = "storm123"
+
+
+def prepare():
+    Base.metadata.create_all(bind=engine)
+
+    db: Session = SessionLocal()
+    try:
+        if not db.query(User).filter(User.email == EMAIL).first():
+            db.add(User(
+                email=EMAIL,
+                username="storm",
+                hashed_password=get_password_hash(PASSWORD),
+                full_name="Login Storm"
+            ))
+            db.commit()
+    finally:
+        db.close()
+
+
+def request(url: str, data: bytes = None) -> int:
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def sample_catalog(url: str, duration: float, concurrency: int):
+    deadline = time.perf_counter() + duration
+    samples = []
+
+    def reader():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            request(url)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(reader)
+    return samples
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[max(0, int(len(samples) * 0.99) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--read-concurrency", type=int, default=4)
+    parser.add_argument("--login-concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    engine.echo = False
+    prepare()
+    base = f"{args.base_url.rstrip('/')}{settings.API_V1_PREFIX}"
+    products_url = f"{base}/products/?limit=20"
+    login_url = f"{base}/auth/login"
+    login_body = urllib.parse.urlencode({"username": EMAIL, "password": PASSWORD}).encode()
+
+    idle = sample_catalog(products_url, args.duration, args.read_concurrency)
+
+    stop = threading.Event()
+    logins = Counter()
+    lock = threading.Lock()
+
+    def storm():
+        while not stop.is_set():
+            code = request(login_url, login_body)
+            with lock:
+                logins[code] += 1
+
+    stormers = [threading.Thread(target=storm, daemon=True) for _ in range(args.login_concurrency)]
+    for thread in stormers:
+        thread.start()
+    loaded = sample_catalog(products_url, args.duration, args.read_concurrency)
+    stop.set()
+    for thread in stormers:
+        thread.join()
+
+    if not idle or not loaded:
+        print("[ERROR] No catalog samples collected; is the API running?")
+        sys.exit(1)
+
+    print(f"[INFO] {args.duration:.0f}s per phase, {args.read_concurrency} readers, {args.login_concurrency} login clients")
+    for name, samples in (("idle", idle), ("login storm", loaded)):
+        p50, p99 = percentiles(samples)
+        print(f"[INFO] GET /products/ {name:<12} n={len(samples):<6} p50={p50:8.2f}ms  p99={p99:8.2f}ms")
+    print(f"[INFO] Login status codes: {dict(sorted(logins.items()))}")
+    print("[SUCCESS] Done")
+
+
+if __name__ == "__main__":
+    main()
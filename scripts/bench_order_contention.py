@@ -0,0 +1,133 @@
+"""
+Concurrency benchmark for stock reservation in the Coffee Shop API.
+
+Creates one product with a limited stock directly in the database, then
+hammers POST /orders/ for that product from many concurrent clients against a
+running API instance. Reports throughput, the status-code mix and the oversell
+count (orders accepted beyond the initial stock).
+
+Usage:
+    python -m scripts.bench_order_contention --stock 100 --requests 500 --concurrency 50
+    OR
+    python scripts/bench_order_contention.py --base-url http://127.0.0.1:8000 (from project root)
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.models import Category, Product, User
+from app.utils.security import create_access_token, get_password_hash
+
+
+def prepare(stock: int):
+    Base.metadata.create_all(bind=engine)
+
+    db: Session = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "bench@coffeeshop.com").first()
+        if not user:
+            user = User(
+                email="bench@coffeeshop.com",
+                username="bench",
+                hashed_password=get_password_hash("bench123"),
+                full_name="Benchmark User"
+            )
+            db.add(user)
+
+        category = db.query(Category).filter(Category.name == "Benchmark").first()
+        if not category:
+            category = Category(name="Benchmark", description="Benchmark products")
+            db.add(category)
+        db.flush()
+
+        product = Product(
+            name=f"Contended drink {int(time.time())}",
+            price=100.0,
+            stock_quantity=stock,
+            is_available=True,
+            category_id=category.id
+        )
+        db.add(product)
+        db.commit()
+        return user.id, product.id
+    finally:
+        db.close()
+
+
+def final_stock(product_id: int) -> int:
+    db: Session = SessionLocal()
+    try:
+        return db.query(Product.stock_quantity).filter(Product.id == product_id).scalar()
+    finally:
+        db.close()
+
+
+def place_order(url: str, token: str, product_id: int, quantity: int) -> int:
+    body = json.dumps({
+        "delivery_address": "Benchmark street",
+        "phone": "+10000000000",
+        "items": [{"product_id": product_id, "quantity": quantity}]
+    }).encode()
+    request = urllib.request.Request(
+        url,
+        data=body,
+        method="POST",
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--quantity", type=int, default=1)
+    args = parser.parse_args()
+
+    user_id, product_id = prepare(args.stock)
+    token = create_access_token(data={"sub": str(user_id)})
+    url = f"{args.base_url.rstrip('/')}{settings.API_V1_PREFIX}/orders/"
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        statuses = Counter(pool.map(
+            lambda _: place_order(url, token, product_id, args.quantity),
+            range(args.requests)
+        ))
+    elapsed = time.perf_counter() - started
+
+    accepted = statuses.get(201, 0)
+    remaining = final_stock(product_id)
+    oversold = max(0, accepted * args.quantity - args.stock)
+
+    print(f"[INFO] {args.requests} requests, concurrency {args.concurrency}, initial stock {args.stock}")
+    print(f"[INFO] Elapsed: {elapsed:.2f}s, throughput: {args.requests / elapsed:.1f} req/s")
+    print(f"[INFO] Status codes: {dict(sorted(statuses.items()))}")
+    print(f"[INFO] Accepted orders: {accepted}, remaining stock: {remaining}")
+    if oversold or remaining < 0 or remaining != args.stock - accepted * args.quantity:
+        print(f"[ERROR] Oversell detected: {oversold} units beyond stock, stock left {remaining}")
+        sys.exit(1)
+    print("[SUCCESS] No oversell")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Fan-out benchmark for order status push.
+
+Against a running API instance, opens --subscribers idle WebSockets spread
+over --orders orders, then moves every order to CONFIRMED with one batch
+status request. Reports how long the subscriptions took to open and the
+delivery latency of the status change (p50/p99/max) across all sockets,
+plus the server's hub statistics.
+
+Run the server with a single worker (the default broker is in-process)
+and --ws-per-message-deflate false, as in production: with compression
+each idle socket holds about 128 KiB of zlib state. The number of open
+files (ulimit -n) must exceed --subscribers.
+
+Usage:
+    python -m scripts.bench_order_events --subscribers 2000 --orders 50
+    OR
+    python scripts/bench_order_events.py --base-url http://127.0.0.1:8000 (from project root)
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import websockets
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.models import Order, User
+from app.models.order import OrderStatus
+from app.utils.security import get_password_hash
+
+EMAIL = "events@coffeeshop.com"
+PASSWORD = "events123"
+
+
+def prepare(orders: int):
+    Base.metadata.create_all(bind=engine)
+
+    db: Session = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == EMAIL).first()
+        if not user:
+            user = User(
+                email=EMAIL,
+                username="events",
+                hashed_password=get_password_hash(PASSWORD),
+                full_name="Order Events",
+                is_admin=True
+            )
+            db.add(user)
+            db.flush()
+        new_orders = [
+            Order(user_id=user.id, status=OrderStatus.PENDING, total_amount=1, delivery_address="Bench", phone="0")
+            for _ in range(orders)
+        ]
+        db.add_all(new_orders)
+        db.commit()
+        return [order.id for order in new_orders]
+    finally:
+        db.close()
+
+
+def call(url: str, data: bytes = None, headers: dict = None) -> dict:
+    with urllib.request.urlopen(urllib.request.Request(url, data=data, headers=headers or {}), timeout=60) as response:
+        return json.loads(response.read())
+
+
+async def subscribe(url: str, ready: asyncio.Event, latencies: list, sent: list):
+    async with websockets.connect(url, open_timeout=60, ping_interval=None) as socket:
+        json.loads(await socket.recv())
+        ready.set()
+        json.loads(await socket.recv())
+        latencies.append((time.perf_counter() - sent[0]) * 1000)
+
+
+async def run(args, api: str, token: str, order_ids):
+    ws_base = api.replace("http", "ws", 1)
+    latencies, sent = [], []
+    started = time.perf_counter()
+    readies, tasks = [], []
+    for i in range(args.subscribers):
+        ready = asyncio.Event()
+        url = f"{ws_base}/orders/{order_ids[i % len(order_ids)]}/ws?token={token}"
+        readies.append(ready)
+        tasks.append(asyncio.create_task(subscribe(url, ready, latencies, sent)))
+        if i % 100 == 99:
+            await asyncio.sleep(0)
+    await asyncio.gather(*(ready.wait() for ready in readies))
+    print(f"[INFO] {args.subscribers} subscribers on {len(order_ids)} orders in {time.perf_counter() - started:.1f}s")
+
+    hub = call(f"{api}/admin/order-events", headers={"Authorization": f"Bearer {token}"})
+    print(f"[INFO] Server hub before: {hub}")
+
+    body = json.dumps({"order_ids": order_ids, "status": OrderStatus.CONFIRMED.value}).encode()
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    sent.append(time.perf_counter())
+    await asyncio.to_thread(call, f"{api}/orders/status", body, headers)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=120)
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if len(latencies) >= 100 else latencies[-1]
+    print(
+        f"[INFO] Delivery latency: p50 {statistics.median(latencies):.1f}ms "
+        f"p99 {p99:.1f}ms max {latencies[-1]:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=50)
+    args = parser.parse_args()
+
+    engine.echo = False
+    order_ids = prepare(args.orders)
+    api = args.base_url.rstrip("/") + settings.API_V1_PREFIX
+    login = urllib.parse.urlencode({"username": EMAIL, "password": PASSWORD}).encode()
+    token = call(f"{api}/auth/login", login)["access_token"]
+
+    asyncio.run(run(args, api, token, order_ids))
+    print("[SUCCESS] Every subscriber received the status change")
+
+
+if __name__ == "__main__":
+    main()
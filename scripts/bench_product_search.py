@@ -0,0 +1,135 @@
+"""
+Benchmark ProductCRUD.search against the previous ILIKE '%q%' query.
+
+For every catalog size the script builds a scratch schema (bench_search) in the
+configured PostgreSQL database, fills it with synthetic products, times the
+legacy query without the search indexes, then creates the indexes declared on
+the Product model and times both the legacy query and the ranked search.
+The scratch schema is dropped at the end; application tables are not touched.
+
+Usage:
+    python -m scripts.bench_product_search --sizes 10000 100000 1000000
+    OR
+    python scripts/bench_product_search.py --repeat 20 (from project root)
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+from app.database import engine, Base
+from app.models import Category, Product
+from app.crud.product import product_crud
+
+SCHEMA = "bench_search"
+SEARCH_INDEXES = ("ix_products_search_document", "ix_products_name_trgm")
+
+WORDS = [
+    "latte", "cappuccino", "espresso", "americano", "mocha", "macchiato", "flat", "white",
+    "vanilla", "caramel", "hazelnut", "cinnamon", "oat", "almond", "coconut", "iced",
+    "double", "decaf", "arabica", "robusta", "ethiopia", "colombia", "brazil", "kenya",
+    "green", "black", "herbal", "chai", "matcha", "cheesecake", "tiramisu", "croissant",
+    "muffin", "cookie", "brownie", "syrup", "beans", "grinder", "press", "kettle",
+]
+
+QUERIES = ["latte", "cap", "vanilla latte", "iced oat", "kenya beans", "zzz"]
+
+
+def populate(conn, size: int):
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.products (name, description, price, is_available, stock_quantity, category_id)
+        SELECT
+            w[1 + (random() * (n - 1))::int] || ' ' || w[1 + (random() * (n - 1))::int] || ' ' || g,
+            w[1 + (random() * (n - 1))::int] || ' ' || w[1 + (random() * (n - 1))::int] || ' '
+                || w[1 + (random() * (n - 1))::int] || ' ' || w[1 + (random() * (n - 1))::int],
+            100 + (random() * 500)::int,
+            true,
+            100,
+            :category_id
+        FROM generate_series(1, :size) AS g,
+             (SELECT CAST(:words AS text[]) AS w, :n AS n) AS vocabulary
+        """
+    ), {"size": size, "words": WORDS, "n": len(WORDS), "category_id": 1})
+    conn.execute(text(f"ANALYZE {SCHEMA}.products"))
+
+
+def timed(fn, repeat: int):
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(fn())
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], rows
+
+
+def legacy_search(db: Session, query: str):
+    return db.query(Product).filter(Product.name.ilike(f"%{query}%")).offset(0).limit(100).all()
+
+
+def run_size(size: int, repeat: int):
+    with engine.connect() as raw:
+        conn = raw.execution_options(schema_translate_map={None: SCHEMA})
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        Base.metadata.create_all(conn, tables=[Category.__table__, Product.__table__])
+        for name in SEARCH_INDEXES:
+            conn.execute(text(f"DROP INDEX {SCHEMA}.{name}"))
+        conn.execute(Category.__table__.insert().values(id=1, name="Benchmark"))
+
+        started = time.perf_counter()
+        populate(conn, size)
+        conn.commit()
+        print(f"\n[INFO] {size} products loaded in {time.perf_counter() - started:.1f}s")
+
+        db = Session(bind=conn)
+        before = {q: timed(lambda: legacy_search(db, q), repeat) for q in QUERIES}
+        db.close()
+
+        started = time.perf_counter()
+        for index in Product.__table__.indexes:
+            if index.name in SEARCH_INDEXES:
+                conn.execute(CreateIndex(index))
+        conn.execute(text(f"ANALYZE {SCHEMA}.products"))
+        conn.commit()
+        print(f"[INFO] Search indexes built in {time.perf_counter() - started:.1f}s")
+
+        db = Session(bind=conn)
+        print(f"{'query':<16}{'ILIKE, no index':>20}{'ILIKE, trigram':>20}{'ranked search':>20}  rows")
+        for q in QUERIES:
+            legacy = timed(lambda: legacy_search(db, q), repeat)
+            ranked = timed(lambda: product_crud.search(db, q, limit=100), repeat)
+            cells = "".join(f"{m:>10.2f} / {p95:>6.2f}ms" for m, p95, _ in (before[q], legacy, ranked))
+            print(f"{q:<16}{cells}  {before[q][2]}/{ranked[2]}")
+        db.close()
+
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("[ERROR] The search benchmark needs PostgreSQL (DATABASE_URL)")
+        sys.exit(1)
+
+    engine.echo = False
+    print("[INFO] Timings are median / p95 over", args.repeat, "runs")
+    for size in args.sizes:
+        run_size(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark response serialization for list pages.
+
+Builds transient Order rows (with items) and Product rows in memory and times,
+per page size, how long each response pipeline takes to turn them into bytes:
+
+    fastapi+json    response_model validation + stdlib json (the old default)
+    fastapi+orjson  response_model validation + ORJSONResponse
+    typeadapter     precompiled TypeAdapter, validate + dump_json (render_json)
+
+No database or server is needed.
+
+Usage:
+    python -m scripts.bench_serialization --sizes 10 100 500
+    OR
+    python scripts/bench_serialization.py --repeat 200 (from project root)
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+from app.models import Order, OrderItem, Product
+from app.models.order import OrderStatus
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+from app.utils.responses import render_json
+
+
+def make_orders(count: int) -> List[Order]:
+    now = datetime.now(timezone.utc)
+    return [
+        Order(
+            id=i, user_id=1, status=OrderStatus.PENDING, total_amount=12.5,
+            delivery_address="Benchmark street 1", phone="+10000000000", notes=None,
+            created_at=now, updated_at=None,
+            order_items=[
+                OrderItem(id=i * 10 + j, order_id=i, product_id=j, quantity=2, price=3.5, created_at=now)
+                for j in range(3)
+            ]
+        )
+        for i in range(count)
+    ]
+
+
+def make_products(count: int) -> List[Product]:
+    now = datetime.now(timezone.utc)
+    return [
+        Product(
+            id=i, name=f"Latte {i}", description="Espresso with steamed milk", price=3.5,
+            image_url=None, is_available=True, stock_quantity=100, category_id=1, created_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def fastapi_pipeline(field, response_class):
+    async def render(rows):
+        content = await serialize_response(field=field, response_content=rows)
+        return response_class(content).body
+    return render
+
+
+def typeadapter_pipeline(adapter):
+    async def render(rows):
+        return render_json(adapter, rows).body
+    return render
+
+
+async def timed(fn, rows, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn(rows)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def run(args):
+    print("[INFO] Median milliseconds per page over", args.repeat, "runs")
+    for name, schema, make in (("orders", OrderResponse, make_orders), ("products", ProductResponse, make_products)):
+        field = create_model_field(name="Response", type_=List[schema], mode="serialization")
+        pipelines = {
+            "fastapi+json": fastapi_pipeline(field, JSONResponse),
+            "fastapi+orjson": fastapi_pipeline(field, ORJSONResponse),
+            "typeadapter": typeadapter_pipeline(TypeAdapter(List[schema])),
+        }
+        print(f"\n{name:<10}" + "".join(f"{label:>16}" for label in pipelines))
+        for size in args.sizes:
+            rows = make(size)
+            cells = [await timed(fn, rows, args.repeat) for fn in pipelines.values()]
+            print(f"{size:<10}" + "".join(f"{ms:>14.3f}ms" for ms in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+    print("\n[SUCCESS] Done")
+
+
+if __name__ == "__main__":
+    main()
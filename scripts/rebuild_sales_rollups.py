@@ -0,0 +1,50 @@
+"""
+Recompute the sales_daily rollup from orders.
+
+The API keeps the rollup current as orders are placed, cancelled and
+deleted; run this periodically (e.g. nightly for the last few days) to
+repair any drift and drop rows left at zero, or once without a range to
+backfill the whole history.
+
+Usage:
+    python -m scripts.rebuild_sales_rollups --since 2026-10-01
+    OR
+    python scripts/rebuild_sales_rollups.py --days 3 (from project root)
+"""
+import argparse
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal, engine
+from app.crud.sales import sales_crud
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, help="first day to rebuild (default: all history)")
+    parser.add_argument("--until", type=date.fromisoformat, help="last day to rebuild (default: no limit)")
+    parser.add_argument("--days", type=int, help="rebuild the last N days including today (UTC)")
+    args = parser.parse_args()
+
+    if args.days is not None:
+        args.since = datetime.now(timezone.utc).date() - timedelta(days=args.days - 1)
+    engine.echo = False
+
+    db = SessionLocal()
+    try:
+        written = sales_crud.rebuild(db, args.since, args.until)
+        span = f"{args.since or 'start'} .. {args.until or 'today'}"
+        print(f"[SUCCESS] Rebuilt {written} rollup rows for {span}")
+    except Exception as e:
+        print(f"[ERROR] Error rebuilding sales rollups: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
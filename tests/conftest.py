@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from itertools import count
+from typing import Iterator, List
+
+# Settings and the engine are built when app is first imported, so the test
+# database has to be chosen before that: a throwaway SQLite file, removed at
+# the end of the session.
+_DB_DIR = tempfile.mkdtemp(prefix="coffee-shop-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["USE_ASYNC_DB"] = "false"
+os.environ["PASSWORD_POOL_WORKERS"] = "0"
+os.environ["ACCESS_LOG"] = "false"
+os.environ["ORDER_EVENTS_BROKER"] = "memory"
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+os.environ.pop("WEB_CONCURRENCY", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.database import Base, SessionLocal, engine
+from app.models import Category, Product, User
+from app.utils.cache import catalog_cache, token_cache, user_cache
+from app.utils.security import create_access_token
+
+_unique = count(1)
+
+# A PostgreSQL database for the tests that need one (LISTEN/NOTIFY, query
+# plans); they are skipped without it. Only scratch objects are created there.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+def pytest_sessionstart(session):
+    # Also done by the app's startup, but not every test starts the app.
+    Base.metadata.create_all(bind=engine)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    engine.dispose()
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Every test starts with empty tables and caches."""
+    for cache in (catalog_cache, user_cache, token_cache):
+        cache.clear()
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@contextmanager
+def _count_statements() -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def count_statements():
+    """Context manager collecting every SQL statement the app's engine sends inside it."""
+    return _count_statements
+
+
+def make_user(db: Session, is_admin: bool = False) -> User:
+    n = next(_unique)
+    user = User(email=f"user{n}@test.com", username=f"user{n}", hashed_password="!", is_admin=is_admin)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_products(db: Session, count: int, **values) -> List[Product]:
+    category = Category(name=f"Category {next(_unique)}")
+    db.add(category)
+    db.flush()
+    products = [
+        Product(**{"name": f"Drink {next(_unique)}", "price": 3.5, "stock_quantity": 100, **values},
+                category_id=category.id)
+        for _ in range(count)
+    ]
+    db.add_all(products)
+    db.commit()
+    return products
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
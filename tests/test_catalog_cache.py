@@ -0,0 +1,55 @@
+from app.config import settings
+from conftest import auth_headers, make_products, make_user
+
+PRODUCTS = f"{settings.API_V1_PREFIX}/products/"
+
+
+def place_order(client, headers, product, quantity):
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/orders/",
+        json={"delivery_address": "Street", "phone": "0", "items": [{"product_id": product.id, "quantity": quantity}]},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def stock_in_list(client, product):
+    rows = client.get(PRODUCTS, params={"category_id": product.category_id}).json()
+    return {row["id"]: row["stock_quantity"] for row in rows}[product.id]
+
+
+def test_orders_and_cancellations_refresh_the_list_stock(client, db, count_statements):
+    product, other = make_products(db, 2, stock_quantity=5)
+    headers = auth_headers(make_user(db))
+    assert stock_in_list(client, product) == 5
+    assert client.get(f"{PRODUCTS}{product.id}").json()["stock_quantity"] == 5
+    # A repeated read is served from the cache.
+    with count_statements() as statements:
+        assert stock_in_list(client, product) == 5
+    assert statements == []
+
+    place_order(client, headers, product, 2)
+    assert stock_in_list(client, product) == 3
+    assert client.get(f"{PRODUCTS}{product.id}").json()["stock_quantity"] == 3
+
+    order = place_order(client, headers, product, 3)
+    assert stock_in_list(client, product) == 0
+    assert stock_in_list(client, other) == 5
+
+    response = client.post(f"{settings.API_V1_PREFIX}/orders/{order['id']}/cancel", headers=headers)
+    assert response.status_code == 200
+    assert stock_in_list(client, product) == 3
+    assert client.get(f"{PRODUCTS}{product.id}").json()["stock_quantity"] == 3
+
+
+def test_product_update_refreshes_its_page_and_the_lists(client, db):
+    product, = make_products(db, 1)
+    admin = auth_headers(make_user(db, is_admin=True))
+    client.get(f"{PRODUCTS}{product.id}")
+    client.get(PRODUCTS, params={"category_id": product.category_id})
+
+    response = client.put(f"{PRODUCTS}{product.id}", json={"price": 9.0}, headers=admin)
+    assert response.status_code == 200
+    assert client.get(f"{PRODUCTS}{product.id}").json()["price"] == 9.0
+    assert client.get(PRODUCTS, params={"category_id": product.category_id}).json()[0]["price"] == 9.0
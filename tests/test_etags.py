@@ -0,0 +1,97 @@
+from datetime import datetime
+from sqlalchemy import update
+from app.config import settings
+from app.models import Order
+from app.models.order import OrderStatus
+from app.utils.cache import catalog_cache
+from conftest import auth_headers, make_products, make_user
+
+PRODUCTS = f"{settings.API_V1_PREFIX}/products/"
+CATEGORIES = f"{settings.API_V1_PREFIX}/categories/"
+
+
+def test_matching_list_etag_gets_304_without_the_list_query(client, db, count_statements):
+    products = make_products(db, 3)
+    params = {"category_id": products[0].category_id}
+    etag = client.get(PRODUCTS, params=params).headers["ETag"]
+    assert not etag.startswith("W/")
+
+    # Also when this worker has nothing cached: only the version is read.
+    for clear in (False, True):
+        if clear:
+            catalog_cache.clear()
+        with count_statements() as statements:
+            response = client.get(PRODUCTS, params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert len(statements) == 1 and "catalog_versions" in statements[0]
+
+
+def test_list_etag_changes_with_product_writes_and_orders(client, db):
+    product, = make_products(db, 1)
+    params = {"category_id": product.category_id}
+    etag = client.get(PRODUCTS, params=params).headers["ETag"]
+    item_etag = client.get(f"{PRODUCTS}{product.id}").headers["ETag"]
+
+    client.post(
+        f"{settings.API_V1_PREFIX}/orders/",
+        json={"delivery_address": "Street", "phone": "0", "items": [{"product_id": product.id, "quantity": 1}]},
+        headers=auth_headers(make_user(db)),
+    )
+    # The order changed the stock both pages show.
+    response = client.get(f"{PRODUCTS}{product.id}", headers={"If-None-Match": item_etag})
+    assert response.status_code == 200
+    assert response.json()["stock_quantity"] == 99
+    response = client.get(PRODUCTS, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["stock_quantity"] == 99
+    assert response.headers["ETag"] != etag
+    etag = response.headers["ETag"]
+
+    admin = auth_headers(make_user(db, is_admin=True))
+    client.put(f"{PRODUCTS}{product.id}", json={"name": "Renamed"}, headers=admin)
+    response = client.get(PRODUCTS, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Renamed"
+    assert response.headers["ETag"] != etag
+
+
+def test_category_etag_is_shared_by_workers_and_follows_writes(client, db):
+    make_products(db, 1)
+    etag = client.get(CATEGORIES).headers["ETag"]
+    assert not etag.startswith("W/")
+    # Another worker, with an empty cache, derives the same ETag.
+    catalog_cache.clear()
+    assert client.get(CATEGORIES).headers["ETag"] == etag
+
+    admin = auth_headers(make_user(db, is_admin=True))
+    assert client.post(CATEGORIES, json={"name": "Tea"}, headers=admin).status_code == 201
+    response = client.get(CATEGORIES, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Tea" in [category["name"] for category in response.json()]
+
+
+def test_missing_product_is_404_for_conditional_requests(client):
+    response = client.get(f"{PRODUCTS}999999", headers={"If-None-Match": '"x"'})
+    assert response.status_code == 404
+
+
+def test_order_etag_follows_status_changes_within_a_second(client, db):
+    customer = make_user(db)
+    stamp = datetime(2026, 1, 1, 12, 0, 0)
+    order = Order(
+        user_id=customer.id, status=OrderStatus.CONFIRMED, total_amount=1,
+        delivery_address="Street", phone="0", updated_at=stamp
+    )
+    db.add(order)
+    db.commit()
+    headers = auth_headers(customer)
+    etag = client.get(f"{settings.API_V1_PREFIX}/orders/{order.id}", headers=headers).headers["ETag"]
+
+    # A second write in the same second leaves updated_at as it was.
+    db.execute(update(Order).where(Order.id == order.id).values(status=OrderStatus.PREPARING, updated_at=stamp))
+    db.commit()
+    response = client.get(f"{settings.API_V1_PREFIX}/orders/{order.id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["status"] == "preparing"
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,106 @@
+import asyncio
+import sys
+import pytest
+from app.config import settings
+from app.schemas.order import OrderStatusEvent
+from app.utils.order_events import MemoryBroker, OrderEventHub, PostgresBroker, broker_name
+from conftest import POSTGRES_URL
+
+
+def event(order_id: int, status: str = "confirmed") -> OrderStatusEvent:
+    return OrderStatusEvent(order_id=order_id, status=status, updated_at=None)
+
+
+async def receive(hubs, publisher, order_id):
+    """Start ``hubs``, publish one event on ``publisher`` and collect what each hub's subscriber gets."""
+    for hub in hubs:
+        await hub.start()
+    try:
+        queues = [hub.subscribe(order_id) for hub in hubs]
+        publisher.publish(event(order_id))
+        return [await asyncio.wait_for(queue.get(), 5) for queue in queues]
+    finally:
+        for hub in hubs:
+            await hub.stop()
+
+
+@pytest.mark.parametrize("variable, value", [("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus"), ("WEB_CONCURRENCY", "4")])
+def test_memory_broker_refuses_several_workers(monkeypatch, variable, value):
+    monkeypatch.setenv(variable, value)
+    with pytest.raises(RuntimeError, match="ORDER_EVENTS_BROKER=postgres"):
+        asyncio.run(MemoryBroker().start())
+
+
+@pytest.mark.parametrize("argv", [
+    ["uvicorn", "main:app", "--workers", "4"],
+    ["uvicorn", "main:app", "--port", "8000", "--workers=2"],
+    ["gunicorn", "main:app", "-w", "3", "-k", "uvicorn.workers.UvicornWorker"],
+    ["gunicorn", "-w4", "main:app"],
+])
+def test_memory_broker_refuses_workers_on_the_command_line(monkeypatch, argv):
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(RuntimeError, match="ORDER_EVENTS_BROKER=postgres"):
+        asyncio.run(MemoryBroker().start())
+
+
+def test_memory_broker_accepts_one_worker(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["uvicorn", "main:app", "--workers", "1", "--port", "8004"])
+    asyncio.run(MemoryBroker().start())
+
+
+@pytest.mark.parametrize("configured, database_url, expected", [
+    ("", "postgresql://shop@db/shop", "postgres"),
+    ("", "postgresql+asyncpg://shop@db/shop", "postgres"),
+    ("", "sqlite:///./coffee_shop.db", "memory"),
+    ("memory", "postgresql://shop@db/shop", "memory"),
+    ("postgres", "sqlite:///./coffee_shop.db", "postgres"),
+])
+def test_broker_defaults_to_postgres_on_postgresql(monkeypatch, configured, database_url, expected):
+    monkeypatch.setattr(settings, "ORDER_EVENTS_BROKER", configured)
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+    assert broker_name() == expected
+
+
+class SlowBroker(MemoryBroker):
+    """Memory broker whose publishes wait for ``release``."""
+
+    async def start(self) -> None:
+        await super().start()
+        self.release = asyncio.Event()
+
+    async def publish(self, event: OrderStatusEvent) -> None:
+        await self.release.wait()
+        await super().publish(event)
+
+
+def test_hub_holds_publishes_until_they_finish():
+    async def run():
+        hub = OrderEventHub(SlowBroker())
+        await hub.start()
+        try:
+            queue = hub.subscribe(7)
+            hub.publish(event(7))
+            await asyncio.sleep(0)
+            # Referenced by the hub, so the pending publish cannot be garbage collected.
+            assert len(hub._publishing) == 1
+            hub.broker.release.set()
+            assert await asyncio.wait_for(queue.get(), 5) == event(7)
+            await asyncio.sleep(0)
+            assert not hub._publishing
+        finally:
+            await hub.stop()
+
+    asyncio.run(run())
+
+
+def test_memory_broker_delivers_to_the_worker_subscribers():
+    hub = OrderEventHub(MemoryBroker())
+    received, = asyncio.run(receive([hub], hub, 7))
+    assert received == event(7)
+    assert hub.stats()["delivered"] == 1
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_postgres_broker_delivers_to_every_worker():
+    publisher, other = OrderEventHub(PostgresBroker(POSTGRES_URL)), OrderEventHub(PostgresBroker(POSTGRES_URL))
+    assert asyncio.run(receive([publisher, other], publisher, 7)) == [event(7), event(7)]
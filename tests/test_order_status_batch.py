@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import select
+from app.config import settings
+from app.crud.order import order_crud
+from app.models import Order
+from app.models.order import OrderStatus
+from app.utils.order_events import order_events
+from conftest import auth_headers, make_user
+
+BATCH = f"{settings.API_V1_PREFIX}/orders/status"
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """The status events published during the test."""
+    events = []
+    monkeypatch.setattr(order_events, "publish", events.append)
+    return events
+
+
+def make_orders(db, user, *statuses):
+    orders = [
+        Order(user_id=user.id, status=status, total_amount=1, delivery_address="Street", phone="0")
+        for status in statuses
+    ]
+    db.add_all(orders)
+    db.commit()
+    return [order.id for order in orders]
+
+
+def statuses(db, order_ids):
+    return [db.scalar(select(Order.status).where(Order.id == order_id)) for order_id in order_ids]
+
+
+def test_batch_moves_orders_that_allow_the_transition(client, db, published):
+    admin = make_user(db, is_admin=True)
+    ids = make_orders(
+        db, admin, OrderStatus.PENDING, OrderStatus.PENDING, OrderStatus.PREPARING, OrderStatus.DELIVERED
+    )
+    missing = ids[-1] + 1000
+
+    response = client.post(
+        BATCH, json={"order_ids": [ids[1], ids[0], *ids[2:], missing, ids[0]], "status": "confirmed"},
+        headers=auth_headers(admin)
+    )
+    assert response.status_code == 200
+    assert response.json() == {"status": "confirmed", "updated": ids[:2], "skipped": sorted([*ids[2:], missing])}
+    assert statuses(db, ids) == [
+        OrderStatus.CONFIRMED, OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.DELIVERED
+    ]
+    # One event per updated order, none for the skipped ones.
+    assert sorted((event.order_id, event.status) for event in published) == [
+        (ids[0], OrderStatus.CONFIRMED), (ids[1], OrderStatus.CONFIRMED)
+    ]
+    assert all(event.updated_at is not None for event in published)
+
+
+@pytest.mark.parametrize("target, allowed", [
+    (OrderStatus.PREPARING, {OrderStatus.CONFIRMED}),
+    (OrderStatus.READY, {OrderStatus.PREPARING}),
+    (OrderStatus.DELIVERED, {OrderStatus.READY}),
+])
+def test_batch_follows_the_status_transitions(db, published, target, allowed):
+    user = make_user(db)
+    sources = [status for status in OrderStatus if status != OrderStatus.CANCELLED]
+    ids = make_orders(db, user, *sources)
+    updated = order_crud.set_status_many(db, ids, target)
+    assert updated == sorted(order_id for order_id, source in zip(ids, sources) if source in allowed)
+    assert len(published) == len(updated)
+
+
+def test_batch_cancellation_is_rejected(client, db, published):
+    admin = make_user(db, is_admin=True)
+    ids = make_orders(db, admin, OrderStatus.PENDING)
+    response = client.post(BATCH, json={"order_ids": ids, "status": "cancelled"}, headers=auth_headers(admin))
+    assert response.status_code == 400
+    assert statuses(db, ids) == [OrderStatus.PENDING]
+    assert published == []
+
+
+def test_batch_is_for_admins(client, db):
+    user = make_user(db)
+    ids = make_orders(db, user, OrderStatus.PENDING)
+    response = client.post(BATCH, json={"order_ids": ids, "status": "confirmed"}, headers=auth_headers(user))
+    assert response.status_code == 403
+    assert statuses(db, ids) == [OrderStatus.PENDING]
@@ -0,0 +1,81 @@
+import pytest
+from app.config import settings
+from app.crud.order import order_crud
+from app.models import Order, OrderItem
+from app.models.order import OrderStatus
+from app.schemas.order import OrderCreate
+from app.utils.cache import user_cache
+from conftest import auth_headers, make_products, make_user
+
+ORDERS = 60
+ITEMS_PER_ORDER = 3
+
+
+@pytest.fixture
+def customer(db):
+    customer = make_user(db)
+    products = make_products(db, ITEMS_PER_ORDER)
+    for _ in range(ORDERS):
+        order = Order(user_id=customer.id, status=OrderStatus.PENDING, total_amount=10.5, delivery_address="Test street 1", phone="0")
+        order.order_items = [OrderItem(product_id=product.id, quantity=1, price=product.price) for product in products]
+        db.add(order)
+    db.commit()
+    return customer
+
+
+@pytest.mark.parametrize("as_admin", [False, True])
+def test_list_orders_runs_same_statements_for_any_page_size(client, db, customer, count_statements, as_admin):
+    headers = auth_headers(make_user(db, is_admin=True) if as_admin else customer)
+    counts = {}
+    for limit in (1, 50):
+        # Each page looks the user up again rather than finding it cached.
+        user_cache.clear()
+        with count_statements() as statements:
+            response = client.get(f"{settings.API_V1_PREFIX}/orders/", params={"limit": limit}, headers=headers)
+        assert response.status_code == 200
+        orders = response.json()
+        assert len(orders) == limit
+        assert all(len(order["order_items"]) == ITEMS_PER_ORDER for order in orders)
+        counts[limit] = len(statements)
+
+    # The user lookup, the orders and one IN query for all of their items.
+    assert counts[1] == counts[50] == 3
+
+
+@pytest.mark.parametrize("load_items", ["selectin", "joined"])
+def test_order_reads_load_items_in_constant_statements(db, customer, count_statements, load_items):
+    reads = {
+        "get_multi": lambda limit: order_crud.get_multi(db, limit=limit, load_items=load_items),
+        "get_by_user": lambda limit: order_crud.get_by_user(db, customer.id, limit=limit, load_items=load_items),
+        "get_by_status": lambda limit: order_crud.get_by_status(
+            db, OrderStatus.PENDING, limit=limit, load_items=load_items
+        ),
+    }
+    for name, read in reads.items():
+        counts = []
+        for limit in (1, 50):
+            db.expunge_all()
+            with count_statements() as statements:
+                orders = read(limit)
+                assert all(len(order.order_items) == ITEMS_PER_ORDER for order in orders)
+            counts.append(len(statements))
+        assert counts[0] == counts[1], f"{name} ({load_items}) ran {counts} statements"
+
+
+def test_order_creation_runs_same_statements_for_any_cart_size(db, count_statements):
+    customer = make_user(db)
+    products = make_products(db, 10)
+    counts = {}
+    for lines in (1, 10):
+        order_in = OrderCreate(
+            delivery_address="Test street 1", phone="0",
+            items=[{"product_id": product.id, "quantity": 2} for product in products[:lines]]
+        )
+        with count_statements() as statements:
+            order = order_crud.create(db, customer.id, order_in)
+        assert len(order.order_items) == lines
+        counts[lines] = len(statements)
+
+    # Reserve the stock, insert the order, insert its items, update the sales
+    # rollup, bump the product list version.
+    assert counts[1] == counts[10] == 5
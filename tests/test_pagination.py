@@ -0,0 +1,50 @@
+from app.config import settings
+from app.models import Order
+from app.models.order import OrderStatus
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from conftest import auth_headers, make_products, make_user
+
+
+def walk(client, path, limit, headers=None, **params):
+    """Ids of every page of ``path`` followed through X-Next-Cursor."""
+    pages = []
+    params = {**params, "limit": limit}
+    while True:
+        response = client.get(f"{settings.API_V1_PREFIX}{path}", params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append([row["id"] for row in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        params["cursor"] = cursor
+
+
+def test_product_cursor_pages_cover_every_row_once(client, db):
+    # Inserted in one go, so they share created_at down to the second.
+    products = make_products(db, 5)
+    pages = walk(client, "/products/", 2, category_id=products[0].category_id)
+    assert pages == [[p.id for p in products[:2]], [p.id for p in products[2:4]], [products[4].id]]
+
+
+def test_order_cursor_pages_cover_every_row_once(client, db):
+    customer = make_user(db)
+    orders = [
+        Order(user_id=customer.id, status=OrderStatus.PENDING, total_amount=1, delivery_address="Street", phone="0")
+        for _ in range(4)
+    ]
+    db.add_all(orders)
+    db.commit()
+    pages = walk(client, "/orders/", 3, headers=auth_headers(customer), include_items=False)
+    assert pages == [[o.id for o in orders[:3]], [orders[3].id]]
+
+
+def test_search_with_cursor_is_rejected(client, db):
+    products = make_products(db, 3)
+    first = client.get(
+        f"{settings.API_V1_PREFIX}/products/", params={"category_id": products[0].category_id, "limit": 2}
+    )
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/products/",
+        params={"search": "Drink", "cursor": first.headers[NEXT_CURSOR_HEADER]}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+from unittest.mock import AsyncMock
+from sqlalchemy import select
+from app.config import settings
+from app.crud.product import async_product_crud
+from app.models import Product
+from conftest import auth_headers, make_products, make_user
+
+IMPORT = f"{settings.API_V1_PREFIX}/products/import"
+
+
+def upload(client, db, content, name="feed.csv", **params):
+    response = client.post(
+        IMPORT, params=params, files={"file": (name, content.encode())},
+        headers=auth_headers(make_user(db, is_admin=True))
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_import_upserts_by_name_in_one_statement_per_batch(client, db, count_statements):
+    existing, = make_products(db, 1, description="Kept", stock_quantity=7)
+    category_id = existing.category_id
+    feed = "name,price,category_id\n" + "".join(
+        f"{name},{price},{category_id}\n" for name, price in [(existing.name, 4.5), ("Mocha", 5), ("Flat white", 4)]
+    )
+
+    with count_statements() as statements:
+        result = upload(client, db, feed)
+    assert result == {"created": 2, "updated": 1, "failed": 0, "errors": []}
+    assert len([s for s in statements if "products" in s and s.lstrip().upper().startswith("INSERT")]) == 1
+
+    db.expire_all()
+    products = {p.name: p for p in db.scalars(select(Product).where(Product.category_id == category_id))}
+    assert len(products) == 3
+    # Only the supplied columns are updated; new rows get the defaults.
+    assert (products[existing.name].price, products[existing.name].description) == (4.5, "Kept")
+    assert products[existing.name].stock_quantity == 7
+    assert (products["Mocha"].stock_quantity, products["Mocha"].is_available) == (0, True)
+
+
+def test_import_merges_rows_with_different_columns(client, db):
+    existing, = make_products(db, 1, stock_quantity=7)
+    category_id = existing.category_id
+    feed = "\n".join([
+        f'{{"name": "{existing.name}", "price": 2, "category_id": {category_id}, "stock_quantity": 1}}',
+        f'{{"name": "Tea", "price": 1, "category_id": {category_id}, "description": "Line\\tbreak\\\\"}}',
+    ])
+    assert upload(client, db, feed, name="feed.jsonl", batch_size=1)["created"] == 1
+
+    db.expire_all()
+    assert db.get(Product, existing.id).stock_quantity == 1
+    assert db.scalar(select(Product.description).where(Product.name == "Tea")) == "Line\tbreak\\"
+
+
+def test_product_names_are_unique(client, db):
+    first, second = make_products(db, 2)
+    admin = auth_headers(make_user(db, is_admin=True))
+    response = client.put(f"{settings.API_V1_PREFIX}/products/{second.id}", json={"name": first.name}, headers=admin)
+    assert response.status_code == 400
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/products/",
+        json={"name": first.name, "price": 1, "category_id": first.category_id},
+        headers=admin
+    )
+    assert response.status_code == 400
+
+
+def test_name_claimed_after_the_check_is_a_400(client, db, monkeypatch):
+    first, second = make_products(db, 2)
+    admin = auth_headers(make_user(db, is_admin=True))
+    # As if a concurrent writer took the name between the check and the commit.
+    monkeypatch.setattr(async_product_crud, "get_by_name", AsyncMock(return_value=None))
+
+    response = client.put(f"{settings.API_V1_PREFIX}/products/{second.id}", json={"name": first.name}, headers=admin)
+    assert (response.status_code, response.json()["detail"]) == (400, "Product with this name already exists")
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/products/",
+        json={"name": first.name, "price": 1, "category_id": first.category_id},
+        headers=admin
+    )
+    assert (response.status_code, response.json()["detail"]) == (400, "Product with this name already exists")
+    db.expire_all()
+    assert db.get(Product, second.id).name == second.name
@@ -0,0 +1,71 @@
+import re
+import pytest
+from app.config import settings
+from app.models import Order, OrderItem
+from app.models.order import OrderStatus
+from app.utils.cache import catalog_cache, token_cache, user_cache
+from conftest import auth_headers, make_products, make_user
+
+# (method, path, maximum statements); paths are formatted with the seeded ids.
+# The caches are cleared before each request, so the counts include the
+# authenticated user lookup and catalog reads; an uncached catalog list or
+# product page also reads its version for the ETag, and an order bumps the
+# product list version.
+BUDGETS = [
+    ("GET", "/users/me", 1),
+    ("GET", "/users/", 2),
+    ("GET", "/users/{user_id}", 2),
+    ("GET", "/categories/", 2),
+    ("GET", "/categories/{category_id}", 1),
+    ("GET", "/products/", 2),
+    ("GET", "/products/?category_id={category_id}", 2),
+    ("GET", "/products/{product_id}", 2),
+    ("GET", "/orders/", 3),
+    ("GET", "/orders/?status_filter=pending", 3),
+    ("GET", "/orders/{order_id}", 3),
+    ("POST", "/orders/", 6),
+    ("POST", "/orders/status", 2),
+    ("GET", "/analytics/sales/daily", 2),
+]
+
+_SERVER_TIMING_STATEMENTS = re.compile(r'db;[^,]*desc="(\d+) statements"')
+
+
+@pytest.fixture
+def seeded(db):
+    """An admin, a category of five products and 20 pending orders of two items each."""
+    admin = make_user(db, is_admin=True)
+    products = make_products(db, 5, stock_quantity=1_000_000)
+    orders = []
+    for _ in range(20):
+        order = Order(user_id=admin.id, status=OrderStatus.PENDING, total_amount=7, delivery_address="Budget", phone="0")
+        order.order_items = [OrderItem(product_id=product.id, quantity=1, price=product.price) for product in products[:2]]
+        orders.append(order)
+    db.add_all(orders)
+    db.commit()
+    return {
+        "headers": auth_headers(admin),
+        "user_id": admin.id,
+        "category_id": products[0].category_id,
+        "product_id": products[0].id,
+        "order_id": orders[0].id,
+        "order_ids": [order.id for order in orders],
+    }
+
+
+@pytest.mark.parametrize("method, path, budget", BUDGETS, ids=[f"{method} {path}" for method, path, _ in BUDGETS])
+def test_route_stays_within_its_query_budget(client, seeded, method, path, budget):
+    bodies = {
+        "/orders/": {
+            "delivery_address": "Budget", "phone": "0", "items": [{"product_id": seeded["product_id"], "quantity": 1}]
+        },
+        "/orders/status": {"order_ids": seeded["order_ids"], "status": OrderStatus.CONFIRMED.value},
+    }
+    for cache in (catalog_cache, user_cache, token_cache):
+        cache.clear()
+    response = client.request(
+        method, settings.API_V1_PREFIX + path.format(**seeded), headers=seeded["headers"], json=bodies.get(path)
+    )
+    assert response.status_code < 400, response.text
+    statements = int(_SERVER_TIMING_STATEMENTS.search(response.headers["Server-Timing"]).group(1))
+    assert statements <= budget
@@ -0,0 +1,190 @@
+"""The CRUD read queries are served by indexes.
+
+Builds a scratch schema (plan_check) in the TEST_POSTGRES_URL database from
+the models, including their indexes, and seeds it with a large synthetic
+dataset: orders spread over two years with a realistic status mix (mostly
+delivered), three items per order, products that are mostly available.
+After ANALYZE each CRUD read is run, the SQL it sends captured and
+EXPLAINed; a plan that reads orders, order_items, products or users with a
+sequential scan fails. The schema is dropped afterwards.
+
+TEST_PLAN_ORDERS sets the number of orders (200000 by default). Users are
+1% of that, so below about 50000 orders the users table is small enough
+that PostgreSQL rightly prefers a sequential scan and the user reads fail.
+"""
+import json
+import os
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models import Category, Order, OrderItem, Product, User
+from app.models.order import OrderStatus
+from app.crud.order import order_crud
+from app.crud.product import product_crud
+from app.crud.user import user_crud
+from conftest import POSTGRES_URL
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+SCHEMA = "plan_check"
+ORDERS = int(os.environ.get("TEST_PLAN_ORDERS", 200_000))
+
+# Tables large enough in production that a sequential scan is a bug.
+LARGE_TABLES = {"orders", "order_items", "products", "users"}
+
+CASES = {
+    "orders: get": lambda db, at: order_crud.get(db, at.order.id),
+    "orders: get_version": lambda db, at: order_crud.get_version(db, at.order.id),
+    "orders: get_rows": lambda db, at: order_crud.get_rows(db),
+    "orders: get_rows after": lambda db, at: order_crud.get_rows(db, after=tuple(at.order)),
+    "orders: get_rows by user": lambda db, at: order_crud.get_rows(db, user_id=7),
+    "orders: get_rows by user after": lambda db, at: order_crud.get_rows(db, user_id=7, after=tuple(at.order)),
+    "orders: get_rows delivered": lambda db, at: order_crud.get_rows(db, status=OrderStatus.DELIVERED),
+    "orders: get_rows pending": lambda db, at: order_crud.get_rows(db, status=OrderStatus.PENDING),
+    "orders: get_multi": lambda db, at: order_crud.get_multi(db),
+    "orders: get_by_user": lambda db, at: order_crud.get_by_user(db, 7),
+    "orders: get_by_status": lambda db, at: order_crud.get_by_status(db, OrderStatus.READY),
+    "orders: export week": lambda db, at: db.execute(
+        order_crud.export_select(at.order.created_at, at.order.created_at + timedelta(days=7))
+    ).all(),
+    "orders: export week delivered": lambda db, at: db.execute(order_crud.export_select(
+        at.order.created_at, at.order.created_at + timedelta(days=7), OrderStatus.DELIVERED
+    )).all(),
+    "order_items: product delete check": lambda db, at: db.execute(text(
+        f"SELECT 1 FROM ONLY {SCHEMA}.order_items x WHERE product_id = :id FOR KEY SHARE OF x"
+    ), {"id": 1}).all(),
+    "products: get": lambda db, at: product_crud.get(db, 1),
+    "products: get_by_name": lambda db, at: product_crud.get_by_name(db, "Drink 7"),
+    "products: get_multi": lambda db, at: product_crud.get_multi(db),
+    "products: get_multi after": lambda db, at: product_crud.get_multi(db, after=tuple(at.product)),
+    "products: get_by_category": lambda db, at: product_crud.get_by_category(db, 3),
+    "products: get_available": lambda db, at: product_crud.get_available(db),
+    "products: export hour": lambda db, at: db.execute(product_crud.export_select(
+        at.product.created_at, at.product.created_at + timedelta(hours=1)
+    )).all(),
+    "users: get_by_email": lambda db, at: user_crud.get_by_email(db, "user7@example.com"),
+    "users: get_by_username": lambda db, at: user_crud.get_by_username(db, "user7"),
+    "users: get_multi": lambda db, at: user_crud.get_multi(db),
+    "users: get_multi after": lambda db, at: user_crud.get_multi(db, after=tuple(at.user)),
+}
+
+
+def populate(conn, orders: int):
+    users = max(orders // 100, 1)
+    products = max(orders // 10, 1)
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.users (email, username, hashed_password, is_active, is_admin, created_at)
+        SELECT 'user' || g || '@example.com', 'user' || g, 'x', true, false,
+               now() - interval '730 days' + g * interval '1 minute'
+        FROM generate_series(1, :users) AS g
+        """
+    ), {"users": users})
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.categories (name)
+        SELECT 'Category ' || g FROM generate_series(1, 20) AS g
+        """
+    ))
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.products (name, price, is_available, stock_quantity, category_id, created_at)
+        SELECT 'Drink ' || g, 100 + g % 500, g % 10 <> 0, 100, 1 + g % 20,
+               now() - interval '730 days' + g * interval '1 second'
+        FROM generate_series(1, :products) AS g
+        """
+    ), {"products": products})
+    # 85% delivered, 5% cancelled, the rest spread over the open statuses.
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.orders (user_id, status, total_amount, delivery_address, phone, created_at)
+        SELECT 1 + g % :users,
+               (CASE WHEN g % 20 < 17 THEN 'DELIVERED' WHEN g % 20 = 17 THEN 'CANCELLED'
+                     ELSE (ARRAY['PENDING', 'CONFIRMED', 'PREPARING', 'READY'])[1 + g % 4] END)::{SCHEMA}.orderstatus,
+               30, 'Plan street ' || g, '+10000000000',
+               now() - interval '730 days' + g * (interval '730 days' / :orders)
+        FROM generate_series(1, :orders) AS g
+        """
+    ), {"users": users, "orders": orders})
+    conn.execute(text(
+        f"""
+        INSERT INTO {SCHEMA}.order_items (order_id, product_id, quantity, price)
+        SELECT o.id, 1 + (o.id * 7 + n) % :products, 1 + n, 10
+        FROM {SCHEMA}.orders AS o, generate_series(0, 2) AS n
+        """
+    ), {"products": products})
+    for table in ("users", "categories", "products", "orders", "order_items"):
+        conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+
+def plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def describe(node: Dict[str, Any]) -> str:
+    target = node.get("Index Name") or node.get("Relation Name")
+    return f"{node['Node Type']} on {target}" if target else node["Node Type"]
+
+
+@pytest.fixture(scope="module")
+def plan_check():
+    """(connection, seeded rows to page from) on the scratch schema, dropped afterwards."""
+    engine = create_engine(POSTGRES_URL)
+    tables = [User.__table__, Category.__table__, Product.__table__, Order.__table__, OrderItem.__table__]
+    with engine.connect() as raw:
+        conn = raw.execution_options(schema_translate_map={None: SCHEMA})
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.commit()
+        try:
+            Base.metadata.create_all(conn, tables=tables)
+            populate(conn, ORDERS)
+            conn.commit()
+            at = SimpleNamespace(
+                order=conn.execute(text(
+                    f"SELECT created_at, id FROM {SCHEMA}.orders ORDER BY id OFFSET :n LIMIT 1"
+                ), {"n": ORDERS // 2}).one(),
+                product=conn.execute(text(f"SELECT created_at, id FROM {SCHEMA}.products ORDER BY id LIMIT 1")).one(),
+                user=conn.execute(text(f"SELECT created_at, id FROM {SCHEMA}.users ORDER BY id LIMIT 1")).one(),
+            )
+            yield conn, at
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_read_does_not_scan_large_tables(plan_check, name):
+    conn, at = plan_check
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(conn.engine, "before_cursor_execute", capture)
+    try:
+        with Session(bind=conn) as db:
+            CASES[name](db, at)
+    finally:
+        event.remove(conn.engine, "before_cursor_execute", capture)
+
+    assert statements
+    for statement, parameters in statements:
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        root = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+        nodes = list(plan_nodes(root))
+        scans = [
+            node["Relation Name"] for node in nodes
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES
+        ]
+        used = ", ".join(describe(node) for node in nodes if "Relation Name" in node)
+        assert not scans, f"sequential scan of {', '.join(scans)} ({used}):\n{statement}"
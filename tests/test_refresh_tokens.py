@@ -0,0 +1,81 @@
+import pytest
+from app.config import settings
+from app.crud import refresh_token
+from app.models import User
+from app.utils.security import get_password_hash
+from conftest import auth_headers, make_user
+
+AUTH = f"{settings.API_V1_PREFIX}/auth"
+PASSWORD = "secret-password"
+
+
+@pytest.fixture(params=["db", "memory"])
+def store(request, monkeypatch):
+    """Runs the test against each refresh token store."""
+    monkeypatch.setattr(refresh_token, "refresh_token_crud", refresh_token._STORES[request.param]())
+    return request.param
+
+
+@pytest.fixture
+def user(db) -> User:
+    user = make_user(db)
+    user.hashed_password = get_password_hash(PASSWORD)
+    db.commit()
+    return user
+
+
+def login(client, user) -> str:
+    response = client.post(f"{AUTH}/login", data={"username": user.email, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()["refresh_token"]
+
+
+def refresh(client, token):
+    return client.post(f"{AUTH}/refresh", json={"refresh_token": token})
+
+
+def test_refresh_rotates_the_token(client, store, user):
+    token = login(client, user)
+    response = refresh(client, token)
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["access_token"] and rotated["refresh_token"] != token
+    assert refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_reused_token_is_rejected(client, store, user):
+    token = login(client, user)
+    assert refresh(client, token).status_code == 200
+    assert refresh(client, token).status_code == 401
+
+
+def test_unknown_token_is_rejected(client, store):
+    assert refresh(client, "not-a-token").status_code == 401
+
+
+def test_logout_revokes_the_token(client, store, user):
+    token, other = login(client, user), login(client, user)
+    assert client.post(f"{AUTH}/logout", json={"refresh_token": token}).status_code == 204
+    assert refresh(client, token).status_code == 401
+    # Other sessions are left alone.
+    assert refresh(client, other).status_code == 200
+
+
+def test_password_change_revokes_every_token(client, store, user, db):
+    tokens = [login(client, user), login(client, user)]
+    bystander = make_user(db)
+    bystander_token = refresh_token.refresh_token_crud.issue(db, bystander.id)
+
+    response = client.put(
+        f"{settings.API_V1_PREFIX}/users/me", json={"password": "another-password"}, headers=auth_headers(user)
+    )
+    assert response.status_code == 200
+    assert [refresh(client, token).status_code for token in tokens] == [401, 401]
+    assert refresh(client, bystander_token).status_code == 200
+
+
+def test_profile_change_keeps_tokens(client, store, user):
+    token = login(client, user)
+    response = client.put(f"{settings.API_V1_PREFIX}/users/me", json={"full_name": "Renamed"}, headers=auth_headers(user))
+    assert response.status_code == 200
+    assert refresh(client, token).status_code == 200
@@ -0,0 +1,129 @@
+import sys
+from collections import defaultdict
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import select
+from app.config import settings
+from app.crud.sales import sales_crud
+from app.models import Order
+from app.models.order import OrderStatus
+from app.models.sales import SalesDaily
+from conftest import auth_headers, make_products, make_user
+from scripts import rebuild_sales_rollups
+
+ORDERS = f"{settings.API_V1_PREFIX}/orders/"
+
+
+def rollup(db):
+    """sales_daily as {(day, product_id): (quantity, revenue)}, without rows left at zero."""
+    db.expire_all()
+    return {
+        (row.day, row.product_id): (row.quantity, pytest.approx(row.revenue))
+        for row in db.scalars(select(SalesDaily))
+        if row.quantity or row.revenue
+    }
+
+
+def expected(db):
+    """The rollup computed from scratch: items of orders that are not cancelled, per day and product."""
+    db.expire_all()
+    totals = defaultdict(lambda: [0, 0.0])
+    for order in db.scalars(select(Order).where(Order.status != OrderStatus.CANCELLED)):
+        for item in order.order_items:
+            total = totals[(order.created_at.date(), item.product_id)]
+            total[0] += item.quantity
+            total[1] += item.quantity * item.price
+    return {key: (quantity, pytest.approx(revenue)) for key, (quantity, revenue) in totals.items()}
+
+
+@pytest.fixture
+def shop(client, db):
+    """An admin, two products and three orders placed through the API."""
+    admin = make_user(db, is_admin=True)
+    headers = auth_headers(admin)
+    latte, mocha = make_products(db, 2)
+    orders = []
+    for lines in [[(latte, 2)], [(latte, 1), (mocha, 3)], [(mocha, 1)]]:
+        body = {
+            "delivery_address": "Street", "phone": "0",
+            "items": [{"product_id": product.id, "quantity": quantity} for product, quantity in lines],
+        }
+        response = client.post(ORDERS, json=body, headers=headers)
+        assert response.status_code == 201
+        orders.append(response.json()["id"])
+    return headers, orders, (latte, mocha)
+
+
+def test_rollup_follows_order_writes(client, db, shop):
+    headers, (first, second, third), (latte, mocha) = shop
+    today = expected(db)
+    assert rollup(db) == today
+    assert {key[1]: value[0] for key, value in today.items()} == {latte.id: 3, mocha.id: 4}
+
+    assert client.post(f"{ORDERS}{first}/cancel", headers=headers).status_code == 200
+    assert rollup(db) == expected(db)
+
+    # Edits that do not change whether the order counts leave the rollup alone.
+    assert client.put(f"{ORDERS}{second}", json={"delivery_address": "Elsewhere"}, headers=headers).status_code == 200
+    assert client.put(f"{ORDERS}{second}", json={"status": "confirmed"}, headers=headers).status_code == 200
+    assert rollup(db) == expected(db)
+
+    assert client.put(f"{ORDERS}{second}", json={"status": "cancelled"}, headers=headers).status_code == 200
+    assert rollup(db) == expected(db)
+    assert client.put(f"{ORDERS}{second}", json={"status": "pending"}, headers=headers).status_code == 200
+    assert rollup(db) == expected(db)
+
+    assert client.delete(f"{ORDERS}{third}", headers=headers).status_code == 204
+    assert client.delete(f"{ORDERS}{first}", headers=headers).status_code == 204
+    assert rollup(db) == expected(db)
+    assert {key[1]: value[0] for key, value in rollup(db).items()} == {latte.id: 1, mocha.id: 3}
+
+
+def test_reports_read_the_rollup(client, db, shop):
+    headers, orders, _ = shop
+    client.post(f"{ORDERS}{orders[0]}/cancel", headers=headers)
+    sales = expected(db)
+    day, = {day for day, _ in sales}
+    response = client.get(f"{settings.API_V1_PREFIX}/analytics/sales/daily", headers=headers)
+    assert response.status_code == 200
+    quantity = sum(quantity for quantity, _ in sales.values())
+    assert [(row["day"], row["quantity"]) for row in response.json()] == [(day.isoformat(), quantity)]
+
+
+def test_rebuild_reproduces_the_rollup(client, db, shop):
+    headers, orders, _ = shop
+    client.post(f"{ORDERS}{orders[0]}/cancel", headers=headers)
+    maintained = rollup(db)
+
+    # Drift: a lost row and a stray one.
+    db.query(SalesDaily).filter(SalesDaily.product_id == next(iter(maintained))[1]).delete()
+    db.add(SalesDaily(day=date(2000, 1, 1), product_id=1, category_id=1, quantity=5, revenue=5))
+    db.commit()
+
+    assert sales_crud.rebuild(db) == len(maintained)
+    assert rollup(db) == maintained == expected(db)
+    # Cancelled orders leave no zero rows behind after a rebuild.
+    assert db.query(SalesDaily).count() == len(maintained)
+
+
+def test_rebuild_only_touches_its_range(db, shop):
+    maintained = rollup(db)
+    today = next(iter(maintained))[0]
+    db.query(SalesDaily).delete()
+    db.commit()
+
+    assert sales_crud.rebuild(db, date_to=today - timedelta(days=1)) == 0
+    assert rollup(db) == {}
+    assert sales_crud.rebuild(db, today, today) == len(maintained)
+    assert rollup(db) == maintained
+
+
+def test_rebuild_script(db, shop, monkeypatch, capsys):
+    maintained = rollup(db)
+    db.query(SalesDaily).delete()
+    db.commit()
+
+    monkeypatch.setattr(sys, "argv", ["rebuild_sales_rollups.py", "--days", "1"])
+    rebuild_sales_rollups.main()
+    assert "[SUCCESS]" in capsys.readouterr().out
+    assert rollup(db) == maintained
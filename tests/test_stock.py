@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select
+from app.config import settings
+from app.crud.order import order_crud
+from app.crud.product import product_crud
+from app.database import SessionLocal
+from app.models import Order, OrderItem, Product
+from app.schemas.order import OrderCreate
+from conftest import auth_headers, make_products, make_user
+
+ORDERS = f"{settings.API_V1_PREFIX}/orders/"
+
+
+def order_body(*lines):
+    return {
+        "delivery_address": "Street", "phone": "0",
+        "items": [{"product_id": product.id, "quantity": quantity} for product, quantity in lines],
+    }
+
+
+def stock(db, product):
+    return db.scalar(select(Product.stock_quantity).where(Product.id == product.id))
+
+
+def test_reserve_stock_is_one_conditional_update(db, count_statements):
+    first, second = make_products(db, 2, stock_quantity=5)
+    with count_statements() as statements:
+        prices = product_crud.reserve_stock(db, {first.id: 2, second.id: 6})
+    db.commit()
+    assert len(statements) == 1 and statements[0].lstrip().upper().startswith("UPDATE")
+    # Only the product with enough stock was reserved.
+    assert prices == {first.id: first.price}
+    assert (stock(db, first), stock(db, second)) == (3, 5)
+
+
+def test_order_beyond_stock_is_rejected(client, db):
+    product, = make_products(db, 1, stock_quantity=3)
+    headers = auth_headers(make_user(db))
+    assert client.post(ORDERS, json=order_body((product, 2)), headers=headers).status_code == 201
+    assert client.post(ORDERS, json=order_body((product, 2)), headers=headers).status_code == 400
+    assert stock(db, product) == 1
+
+
+def test_unavailable_product_is_not_sold(client, db):
+    product, = make_products(db, 1, is_available=False)
+    response = client.post(ORDERS, json=order_body((product, 1)), headers=auth_headers(make_user(db)))
+    assert response.status_code == 400
+    assert stock(db, product) == 100
+
+
+def test_failed_multi_item_order_releases_everything(client, db):
+    plenty, scarce = make_products(db, 2, stock_quantity=5)
+    db.query(Product).filter(Product.id == scarce.id).update({"stock_quantity": 1})
+    db.commit()
+    response = client.post(ORDERS, json=order_body((plenty, 2), (scarce, 2)), headers=auth_headers(make_user(db)))
+    assert response.status_code == 400
+    assert (stock(db, plenty), stock(db, scarce)) == (5, 1)
+    assert db.scalar(select(func.count()).select_from(Order)) == 0
+    assert db.scalar(select(func.count()).select_from(OrderItem)) == 0
+
+
+def test_concurrent_orders_never_oversell(db):
+    product, = make_products(db, 1, stock_quantity=5)
+    customer = make_user(db)
+    order_in = OrderCreate(delivery_address="Street", phone="0", items=[{"product_id": product.id, "quantity": 1}])
+
+    def place(_):
+        session = SessionLocal()
+        try:
+            return order_crud.create(session, customer.id, order_in) is not None
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        placed = list(pool.map(place, range(20)))
+    assert placed.count(True) == 5
+    assert stock(db, product) == 0
+
+
+def test_cancel_restocks_once(client, db):
+    product, = make_products(db, 1, stock_quantity=5)
+    headers = auth_headers(make_user(db))
+    order = client.post(ORDERS, json=order_body((product, 3)), headers=headers).json()
+    assert stock(db, product) == 2
+
+    assert client.post(f"{ORDERS}{order['id']}/cancel", headers=headers).status_code == 200
+    assert client.post(f"{ORDERS}{order['id']}/cancel", headers=headers).status_code == 400
+    assert stock(db, product) == 5
@@ -0,0 +1,26 @@
+from app.config import settings
+from app.crud.user import user_crud
+from app.models import User
+from conftest import auth_headers, make_user
+
+ORDERS = f"{settings.API_V1_PREFIX}/orders/"
+
+
+def test_user_not_matching_the_response_schema_can_authenticate(client, db):
+    # Stored before UserResponse required three characters.
+    user = User(email="old@test.com", username="ab", hashed_password="!")
+    db.add(user)
+    db.commit()
+    assert client.get(ORDERS, headers=auth_headers(user)).status_code == 200
+
+
+def test_principal_is_cached_until_the_user_changes(client, db, count_statements):
+    user = make_user(db)
+    headers = auth_headers(user)
+    assert client.get(ORDERS, headers=headers, params={"include_items": False}).status_code == 200
+    with count_statements() as statements:
+        assert client.get(ORDERS, headers=headers, params={"include_items": False}).status_code == 200
+    assert not any("FROM users" in statement for statement in statements)
+
+    assert user_crud.delete(db, user.id)
+    assert client.get(ORDERS, headers=headers).status_code == 401